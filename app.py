@@ -1,15 +1,18 @@
+import codecs
 import os
 import re
+import select
 import streamlit as st
 import subprocess
 import sys
 import time
+from collections.abc import Iterator
 from pathlib import Path
 import pandas as pd
 
 # Import internal modules
 try:
-    from src.scanner import FunctionInfo, ScanResult, scan_codebase
+    from src.scanner import FunctionInfo, ScanResult, collect_python_files, scan_codebase
 except ImportError:
     st.error("Scanner module not found. Run from the project root: `streamlit run app.py`")
     st.stop()
@@ -52,6 +55,8 @@ if "scanned_path" not in st.session_state:
     st.session_state.scanned_path = None
 if "celebrate" not in st.session_state:
     st.session_state.celebrate = False
+if "scan_fingerprint" not in st.session_state:
+    st.session_state.scan_fingerprint = None
 
 # --- 4. Sidebar: Configuration ---
 with st.sidebar:
@@ -77,6 +82,26 @@ if st.session_state.scanned_path and st.session_state.scanned_path != project_pa
 
 # --- 5. Core Controller ---
 
+_EXCLUDE_DIRS = {".git", "__pycache__", "venv", "node_modules", "tests"}
+
+
+def _tree_fingerprint(root: Path, exclude_dirs: set[str]) -> tuple:
+    """Snapshot (path, mtime, size) for every .py file so any edit changes the key."""
+    entries = []
+    for path in collect_python_files(root, exclude_dirs):
+        info = path.stat()
+        entries.append((path.as_posix(), info.st_mtime_ns, info.st_size))
+    return tuple(entries)
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _cached_scan(
+    root_str: str, exclude_tuple: tuple[str, ...], force: bool, fingerprint: tuple
+) -> ScanResult:
+    """Memoized scan — *fingerprint* is only part of the cache key."""
+    return scan_codebase(Path(root_str), exclude_dirs=set(exclude_tuple), force=force)
+
+
 def run_analysis() -> ScanResult | None:
     """Perform a fresh scan and store results in session state."""
     root = Path(project_path)
@@ -90,14 +115,26 @@ def run_analysis() -> ScanResult | None:
 
     with st.spinner("Agent is analyzing codebase..."):
         try:
-            results = scan_codebase(
-                root,
-                exclude_dirs={".git", "__pycache__", "venv", "node_modules", "tests"},
-                force=False,
+            fingerprint = _tree_fingerprint(root, _EXCLUDE_DIRS)
+            results = _cached_scan(
+                str(root),
+                tuple(sorted(_EXCLUDE_DIRS)),
+                False,
+                fingerprint,
             )
             st.session_state.scan_results = results
             st.session_state.scanned_path = project_path
-            status_placeholder.success("Analysis complete.")
+            st.session_state.scan_fingerprint = fingerprint
+            if results.errors:
+                # Unparsable files are left out of the results, not reported as clean
+                st.warning("Scanner error: " + "; ".join(
+                    f"{path}: {msg}" for path, msg in results.errors
+                ))
+                status_placeholder.warning(
+                    f"Analysis complete — {len(results.errors)} file(s) could not be scanned."
+                )
+            else:
+                status_placeholder.success("Analysis complete.")
             return results
         except Exception as e:
             st.warning(f"Scanner error: {e}")
@@ -111,8 +148,58 @@ if scan_btn:
 
 # --- 6. Auto-Fix Engine ---
 
-_STRIP_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+# One pass per line: ANSI escapes are dropped, progress keywords are tagged.
+_LINE_RE = re.compile(r"\x1b\[[0-9;]*m|(?P<fixed>Fixed)|(?P<skipped>Skipping)|(?P<error>Error)")
 _TIMEOUT_SECONDS = 600  # 10 minutes
+_POLL_INTERVAL = 0.1    # seconds between pipe polls
+
+
+def _stream_lines(proc: subprocess.Popen, deadline: float) -> Iterator[str]:
+    """Yield output lines from *proc* as they arrive, until EOF or *deadline*.
+
+    The pipe is polled with ``select`` and drained with ``os.read`` in 64 KiB
+    chunks, so a slow UI update never leaves the child blocked on a full pipe
+    buffer. Bytes are decoded incrementally to survive split UTF-8 sequences.
+    """
+    assert proc.stdout is not None  # started with stdout=PIPE
+    fd = proc.stdout.fileno()
+    os.set_blocking(fd, False)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while time.time() <= deadline:
+        ready, _, _ = select.select([proc.stdout], [], [], _POLL_INTERVAL)
+        if not ready:
+            if proc.poll() is not None:
+                break
+            continue
+        chunk = os.read(fd, 65536)
+        if not chunk:  # EOF
+            break
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _classify_line(raw_line: str) -> tuple[str, str | None]:
+    """Strip ANSI codes from *raw_line* and report its progress keyword, if any.
+
+    Keyword precedence matches the fix output: fixed > skipped > error.
+    """
+    parts: list[str] = []
+    found: set[str] = set()
+    pos = 0
+    for m in _LINE_RE.finditer(raw_line):
+        parts.append(raw_line[pos:m.start()])
+        if m.lastgroup:
+            parts.append(m.group())
+            found.add(m.lastgroup)
+        pos = m.end()
+    parts.append(raw_line[pos:])
+    kind = next((k for k in ("fixed", "skipped", "error") if k in found), None)
+    return "".join(parts).rstrip(), kind
 
 
 def _run_auto_fix(target_path: str, total_issues: int) -> None:
@@ -135,7 +222,7 @@ def _run_auto_fix(target_path: str, total_issues: int) -> None:
                 [sys.executable, "main.py", "fix", target_path],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
+                bufsize=-1,
                 env=env,
             )
         except FileNotFoundError:
@@ -144,17 +231,17 @@ def _run_auto_fix(target_path: str, total_issues: int) -> None:
 
         deadline = time.time() + _TIMEOUT_SECONDS
 
-        for raw_line in proc.stdout:
-            line = _STRIP_ANSI.sub("", raw_line).rstrip()
+        for raw_line in _stream_lines(proc, deadline):
+            line, kind = _classify_line(raw_line)
             if not line:
                 continue
 
             # Parse progress from main.py output
-            if "Fixed" in line:
+            if kind == "fixed":
                 fixed += 1
-            elif "Skipping" in line:
+            elif kind == "skipped":
                 skipped += 1
-            elif "Error" in line:
+            elif kind == "error":
                 errors += 1
 
             log_lines.append(line)
@@ -164,13 +251,13 @@ def _run_auto_fix(target_path: str, total_issues: int) -> None:
             )
             log_area.code("\n".join(log_lines[-25:]))
 
-            if time.time() > deadline:
-                proc.kill()
-                st.warning(
-                    f"Timed out after {_TIMEOUT_SECONDS // 60} minutes. "
-                    f"Fixed {fixed} functions before timeout."
-                )
-                break
+        if proc.poll() is None and time.time() > deadline:
+            proc.kill()
+            proc.communicate()
+            st.warning(
+                f"Timed out after {_TIMEOUT_SECONDS // 60} minutes. "
+                f"Fixed {fixed} functions before timeout."
+            )
 
         proc.wait(timeout=30)
 
@@ -195,22 +282,40 @@ def _run_auto_fix(target_path: str, total_issues: int) -> None:
 
 # --- 7. Dashboard View ---
 
-def _get_actually_missing(res: ScanResult) -> list[FunctionInfo]:
-    """Compute functions with genuinely missing hints (ignores force flag)."""
-    return [
-        f for f in res.functions
-        if f.params_missing_hints or not f.has_return_type
-    ]
+@st.cache_resource(max_entries=8)
+def _issues_df(
+    scanned_path: str, fingerprint: tuple, proj_prefix: str, _missing_funcs: list[FunctionInfo]
+) -> pd.DataFrame:
+    """Build the issues table once per scan and share it across reruns without copying.
+
+    Keyed on *scanned_path* and the tree *fingerprint* the scan ran against,
+    which identify the scan across sessions; ``id(res)`` would not, since
+    CPython reuses ids once the previous result is freed.
+    """
+    rows = (
+        (
+            str(f.file_path).removeprefix(proj_prefix),
+            f.name,
+            ", ".join(f.params_missing_hints) or "None",
+            "Yes" if not f.has_return_type else "No",
+        )
+        for f in _missing_funcs
+    )
+    return pd.DataFrame.from_records(
+        rows, columns=["File", "Function", "Missing Params", "Missing Return"]
+    )
 
 
 if st.session_state.scan_results:
     res = st.session_state.scan_results
 
     total_funcs = len(res.functions)
-    missing_funcs = _get_actually_missing(res)
+    # The dashboard always scans with force=False, so this is the real filter
+    missing_funcs = res.functions_missing_hints
     missing_count = len(missing_funcs)
 
-    st.header(f"Project: {Path(project_path).name}")
+    project_root = Path(project_path)
+    st.header(f"Project: {project_root.name}")
 
     # Metrics Row
     m1, m2, m3, m4 = st.columns(4)
@@ -248,15 +353,13 @@ if st.session_state.scan_results:
                 """, unsafe_allow_html=True)
         else:
             st.subheader(f"⚠️ {missing_count} functions require modernization")
-            data = []
-            for f in missing_funcs:
-                data.append({
-                    "File": str(f.file_path).replace(str(Path(project_path)), ""),
-                    "Function": f.name,
-                    "Missing Params": ", ".join(f.params_missing_hints) if f.params_missing_hints else "None",
-                    "Missing Return": "Yes" if not f.has_return_type else "No",
-                })
-            st.dataframe(pd.DataFrame(data), use_container_width=True, hide_index=True)
+            issues_df = _issues_df(
+                st.session_state.scanned_path,
+                st.session_state.scan_fingerprint,
+                str(project_root),
+                missing_funcs,
+            )
+            st.dataframe(issues_df, use_container_width=True, hide_index=True)
 
     with tab2:
         st.subheader("Autonomous AI Repair")
@@ -6,6 +6,7 @@ import json
 import time
 from datetime import datetime
 from typing import TYPE_CHECKING
+from urllib.parse import urlencode
 
 if TYPE_CHECKING:
     import aiohttp
@@ -13,8 +14,7 @@ if TYPE_CHECKING:
 
 # 1. Completely untyped — no hints at all
 def build_url(base: str, endpoint: str, params: dict[str, str | int | float]) -> str:
-    query = "&".join(f"{k}={v}" for k, v in params.items())
-    return f"{base}/{endpoint}?{query}" if params else f"{base}/{endpoint}"
+    return f"{base}/{endpoint}?{urlencode(params)}" if params else f"{base}/{endpoint}"
 
 
 # 2. Missing return type only
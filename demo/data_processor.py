@@ -1,34 +1,32 @@
 """Toy data processing pipeline — zero type annotations."""
 
+from collections import defaultdict
 from typing import Any
 
 
 def flatten(nested_list: list[Any]) -> list[Any]:
     result = []
-    for item in nested_list:
-        if isinstance(item, list):
-            result.extend(flatten(item))
-        else:
+    stack = [iter(nested_list)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                stack.append(iter(item))
+                break
             result.append(item)
+        else:
+            stack.pop()
     return result
 
 
 def deduplicate(items: list) -> list:
-    seen = set()
-    out = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            out.append(item)
-    return out
+    return list(dict.fromkeys(items))
 
 
 def group_by(records: list[dict[str, object]], key: str) -> dict[object, list[dict[str, object]]]:
-    groups = {}
+    groups = defaultdict(list)
     for record in records:
-        k = record[key]
-        groups.setdefault(k, []).append(record)
-    return groups
+        groups[record[key]].append(record)
+    return dict(groups)
 
 
 def average(numbers: list[float]) -> float:
@@ -1,12 +1,16 @@
 """String manipulation helpers — completely untyped."""
 
+_DROP_SPACE = str.maketrans("", "", " ")
+# Vowels collapse to a sentinel; any pre-existing sentinel is dropped.
+_VOWEL_MAP = str.maketrans("AEIOUaeiou", "\x01" * 10, "\x01")
+
 
 def reverse_string(s: str) -> str:
     return s[::-1]
 
 
 def count_vowels(text: str) -> int:
-    return sum(1 for ch in text.lower() if ch in "aeiou")
+    return text.translate(_VOWEL_MAP).count("\x01")
 
 
 def truncate(text: str, max_length: int, suffix: str) -> str:
@@ -16,5 +20,6 @@ def truncate(text: str, max_length: int, suffix: str) -> str:
 
 
 def is_palindrome(word: str) -> bool:
-    cleaned = word.lower().replace(" ", "")
-    return cleaned == cleaned[::-1]
+    cleaned = word.lower().translate(_DROP_SPACE)
+    n = len(cleaned)
+    return all(cleaned[i] == cleaned[n - 1 - i] for i in range(n // 2))
@@ -2,19 +2,27 @@
 
 import re
 
+_EMAIL_RE = re.compile(r"[\w.+\-]+@[\w\-]+\.[\w.\-]+")
+
 
 def is_valid_email(email: str) -> bool:
-    pattern = r"^[\w\.\+\-]+@[\w\-]+\.[\w\.\-]+$"
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.fullmatch(email) is not None
 
 
 def is_strong_password(password: str) -> bool:
     if len(password) < 8:
         return False
-    has_upper = any(c.isupper() for c in password)
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    return has_upper and has_lower and has_digit
+    flags = 0
+    for c in password:
+        if c.isupper():
+            flags |= 1
+        elif c.islower():
+            flags |= 2
+        elif c.isdigit():
+            flags |= 4
+        if flags == 7:
+            return True
+    return False
 
 
 def clamp(value: float, min_val: float, max_val: float) -> float:
@@ -11,9 +11,15 @@ from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, MofNCompleteColumn
 from rich.table import Table
 
-from src.scanner import build_project_context, get_python_files, scan_codebase
-from src.generator import apply_patches, generate_test_suite, generate_type_hint_patch, infer_type_hints
-from src.verifier import run_mypy, run_pytest
+from src.scanner import FunctionInfo, build_project_context, get_python_files, scan_codebase
+from src.generator import (
+    apply_patches,
+    build_hint_prompt,
+    generate_test_suite,
+    generate_type_hint_patch,
+    infer_type_hints,
+)
+from src.verifier import run_mypy, stop_mypy_daemon, verify_test_files
 
 load_dotenv()
 
@@ -35,9 +41,12 @@ def scan(root: Path, exclude: list[str] | None, force: bool) -> None:
 
     at_risk = result.functions_missing_hints
     console.print(f"[bold]Scanned {result.files_scanned} file(s) — {len(at_risk)} function(s) at risk[/bold]\n")
+    for path, msg in result.errors:
+        console.print(f"[red]Could not scan {path}: {msg}[/red]")
 
     if not at_risk:
-        console.print("[green]No missing type hints found![/green]")
+        if not result.errors:
+            console.print("[green]No missing type hints found![/green]")
         return
 
     table = Table(title="Functions Missing Type Hints")
@@ -74,6 +83,14 @@ def fix(
     project_context = build_project_context(path, exclude_dirs=exclude_dirs)
     ctx_tokens = len(project_context) // 4
     console.print(f"[dim]Project context: ~{ctx_tokens:,} tokens[/dim]\n")
+    prompt = build_hint_prompt(project_context)
+
+    # Phase 2: One scan over the whole tree, grouped by file for patching
+    scan_result = scan_codebase(Path(path), exclude_dirs=exclude_dirs, force=force)
+    by_file: dict[Path, list[FunctionInfo]] = {}
+    for func in scan_result.functions_missing_hints:
+        by_file.setdefault(func.file_path, []).append(func)
+    scan_errors = dict(scan_result.errors)
 
     succeeded, failed = 0, 0
     errors: list[tuple[Path, str]] = []
@@ -89,24 +106,36 @@ def fix(
 
         for file in files:
             progress.update(task, description=f"Fixing {file.name}")
+            if file in scan_errors:
+                failed += 1
+                errors.append((file, scan_errors[file]))
+                console.print(f"  [red]Error processing {file}: {scan_errors[file]}[/red]")
+                progress.advance(task)
+                continue
             try:
-                result = scan_codebase(file, exclude_dirs=exclude_dirs, force=force)
-                at_risk = result.functions_missing_hints
+                at_risk = by_file.get(file)
                 if not at_risk:
                     succeeded += 1
                     progress.advance(task)
                     continue
 
+                # Patch every function against the same source, then write once
+                patched: list[FunctionInfo] = []
+                patches = []
                 for func in at_risk:
-                    hints = infer_type_hints(func, project_context=project_context)
+                    hints = infer_type_hints(func, prompt)
                     if hints is None:
                         console.print(
                             f"  [yellow]Skipping '{func.name}' in {file} — could not infer[/yellow]"
                         )
                         continue
-                    patch = generate_type_hint_patch(func, hints)
-                    modified_sources = apply_patches([patch], dry_run=False)
-                    patch.file_path.write_text(modified_sources[0])
+                    patches.append(generate_type_hint_patch(func, hints))
+                    patched.append(func)
+
+                if patches:
+                    modified_sources = apply_patches(patches, dry_run=False)
+                    file.write_text(modified_sources[0])
+                for func in patched:
                     console.print(
                         f"  [green]Fixed '{func.name}' in {func.file_path}:{func.line_number}[/green]"
                     )
@@ -183,41 +212,54 @@ def verify(
     table.add_column("Target", style="white")
     table.add_column("Result", justify="center")
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        MofNCompleteColumn(),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Verifying files...", total=len(files))
-
-        for file in files:
-            progress.update(task, description=f"Verifying {file.name}")
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Verifying files...", total=len(files))
+
+            # Run every generated suite in one batch rather than one pytest session per file
+            test_files = [Path(f"tests/generated/test_{file.name}") for file in files]
+            progress.update(task, description="Running generated tests")
             try:
-                test_file = f"tests/generated/test_{file.name}"
-                mypy_passed = run_mypy(str(file))
-                pytest_passed = run_pytest(test_file)
-
-                mypy_status = "[green]PASS[/green]" if mypy_passed else "[red]FAIL[/red]"
-                pytest_status = "[green]PASS[/green]" if pytest_passed else "[red]FAIL[/red]"
-
-                table.add_row("Type Check", str(file), mypy_status)
-                table.add_row("Unit Tests", test_file, pytest_status)
-
-                if mypy_passed and pytest_passed:
-                    succeeded += 1
-                else:
+                source_dirs = list(dict.fromkeys(str(file.resolve().parent) for file in files))
+                test_results = dict(zip(test_files, verify_test_files(test_files, source_dirs)))
+            except (ImportError, OSError) as exc:  # pytest not installed, or unreadable files
+                console.print(f"  [red]Error running generated tests: {exc}[/red]")
+                test_results = {}
+
+            for file, test_file in zip(files, test_files):
+                progress.update(task, description=f"Verifying {file.name}")
+                try:
+                    mypy_passed = run_mypy(str(file))
+                    pytest_passed = test_file in test_results and test_results[test_file].passed
+
+                    mypy_status = "[green]PASS[/green]" if mypy_passed else "[red]FAIL[/red]"
+                    pytest_status = "[green]PASS[/green]" if pytest_passed else "[red]FAIL[/red]"
+
+                    table.add_row("Type Check", str(file), mypy_status)
+                    table.add_row("Unit Tests", str(test_file), pytest_status)
+
+                    if mypy_passed and pytest_passed:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                        if not mypy_passed:
+                            errors.append((file, "mypy check failed"))
+                        if not pytest_passed:
+                            errors.append((file, "pytest failed"))
+                except Exception as exc:
                     failed += 1
-                    if not mypy_passed:
-                        errors.append((file, "mypy check failed"))
-                    if not pytest_passed:
-                        errors.append((file, "pytest failed"))
-            except Exception as exc:
-                failed += 1
-                errors.append((file, str(exc)))
-                console.print(f"  [red]Error verifying {file}: {exc}[/red]")
-            progress.advance(task)
+                    errors.append((file, str(exc)))
+                    console.print(f"  [red]Error verifying {file}: {exc}[/red]")
+                progress.advance(task)
+    finally:
+        # The daemon outlives this process unless stopped, even after an error
+        stop_mypy_daemon()
 
     console.print()
     console.print(table)
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import ast
+import threading
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import anthropic
+from src.scanner import FunctionInfo, load_source, split_source_lines
 
-from src.scanner import FunctionInfo
+if TYPE_CHECKING:
+    import anthropic
 
 TYPE_HINT_SYSTEM_PROMPT = (
     "You are a Python expert. Return ONLY the function signature with precise type hints.\n"
@@ -34,16 +37,23 @@ TYPE_HINT_SYSTEM_PROMPT_WITH_CONTEXT = (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeHintPatch:
-    """A proposed change that adds type hints to a function."""
+    """A proposed change that adds type hints to a function.
+
+    *span* is the 0-based, half-open line range of the original ``def``
+    header and *replacement* the line that replaces it; together they let
+    :func:`apply_patches` combine several patches to the same file.
+    """
 
     file_path: Path
     original_source: str
     patched_source: str
+    span: tuple[int, int] | None = None
+    replacement: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """A generated unit-test skeleton for a single function."""
 
@@ -52,53 +62,99 @@ class TestCase:
     test_code: str
 
 
+# ── Anthropic client ─────────────────────────────────────────────────
+
+_client: anthropic.Anthropic | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> anthropic.Anthropic:
+    """Return a process-wide client so every call reuses its warm connection pool.
+
+    The SDK is imported here rather than at module load, so scan-only callers
+    (e.g. the MCP ``scan_project`` tool) never pay for importing it.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import anthropic
+                import httpx
+
+                _client = anthropic.Anthropic(
+                    max_retries=2,
+                    timeout=30.0,
+                    http_client=anthropic.DefaultHttpxClient(
+                        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+                    ),
+                )
+    return _client
+
+
 # ── Type-hint generation ─────────────────────────────────────────────
 
-def infer_type_hints(func: FunctionInfo, project_context: str | None) -> dict[str, str] | None:
+@dataclass(slots=True)
+class HintPrompt:
+    """System prompt and model for a run of type-hint inference calls."""
+
+    system: str | list[dict]
+    model: str
+
+
+def build_hint_prompt(project_context: str | None) -> HintPrompt:
+    """Assemble the system prompt once per run, so each call only adds the function.
+
+    With a project context the context is sent as a second system block marked
+    as a cacheable prefix; without one the plain single-file prompt is used.
+    """
+    if not project_context:
+        return HintPrompt(system=TYPE_HINT_SYSTEM_PROMPT, model="claude-sonnet-4-5-20250929")
+    return HintPrompt(
+        system=[
+            {"type": "text", "text": TYPE_HINT_SYSTEM_PROMPT_WITH_CONTEXT},
+            {
+                "type": "text",
+                "text": f"--- PROJECT CONTEXT ---\n{project_context}",
+                "cache_control": {"type": "ephemeral"},
+            },
+        ],
+        model="claude-opus-4-6",
+    )
+
+
+def infer_type_hints(
+    func: FunctionInfo,
+    prompt: HintPrompt,
+    client: anthropic.Anthropic | None = None,
+) -> dict[str, str] | None:
     """Call the LLM to infer precise type hints for *func*.
 
-    When *project_context* is provided, the LLM uses cross-file awareness
-    to produce consistent, project-aware type annotations.
+    *prompt* comes from :func:`build_hint_prompt`; when it carries the project
+    context, the LLM uses cross-file awareness to produce consistent,
+    project-aware type annotations. *client* defaults to the shared
+    module-level client.
 
     Returns a mapping of param-name -> type string (plus ``"return"`` key),
     or ``None`` when inference fails.
     """
     # Extract the function source from the file
-    source = func.file_path.read_text(encoding="utf-8")
-    tree = ast.parse(source, filename=str(func.file_path))
-
-    func_source = None
-    for node in ast.walk(tree):
-        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            continue
-        if node.name == func.name and node.lineno == func.line_number:
-            func_source = ast.get_source_segment(source, node)
-            break
-
+    parsed = load_source(func.file_path)
+    node = parsed.func_index.get((func.name, func.line_number))
+    if node is None:
+        return None
+    func_source = ast.get_source_segment(parsed.source, node)
     if func_source is None:
         return None
 
-    # Build the prompt — with or without global context
-    if project_context:
-        system_prompt = (
-            TYPE_HINT_SYSTEM_PROMPT_WITH_CONTEXT
-            + "\n\n--- PROJECT CONTEXT ---\n"
-            + project_context
-        )
-        model = "claude-opus-4-6"
-    else:
-        system_prompt = TYPE_HINT_SYSTEM_PROMPT
-        model = "claude-sonnet-4-5-20250929"
-
     user_msg = f"Add type hints to this function from {func.file_path.name}:\n\n{func_source}"
 
     # Ask the LLM for a typed signature
     try:
-        client = anthropic.Anthropic()
+        client = client or _get_client()
         response = client.messages.create(
-            model=model,
+            model=prompt.model,
             max_tokens=256,
-            system=system_prompt,
+            system=prompt.system,
             messages=[{"role": "user", "content": user_msg}],
             temperature=0,
         )
@@ -140,82 +196,128 @@ def infer_type_hints(func: FunctionInfo, project_context: str | None) -> dict[st
         return None
 
 
-def generate_type_hint_patch(func: FunctionInfo, hints: dict[str, str]) -> TypeHintPatch:
-    """Build a full source-level patch that inserts the inferred type hints."""
-    source = func.file_path.read_text(encoding="utf-8")
-    tree = ast.parse(source, filename=str(func.file_path))
+def _end_position(node: ast.expr | ast.arg) -> tuple[int, int]:
+    """Return *node*'s (end line, end column); ``ast.parse`` always sets both."""
+    assert node.end_lineno is not None and node.end_col_offset is not None
+    return node.end_lineno, node.end_col_offset
 
-    for node in ast.walk(tree):
-        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            continue
-        if node.name != func.name or node.lineno != func.line_number:
-            continue
 
-        # Build new parameter list
-        new_params = []
-        for arg in node.args.args:
-            if arg.arg in ("self", "cls"):
-                new_params.append(arg.arg)
-            elif arg.arg in hints:
-                new_params.append(f"{arg.arg}: {hints[arg.arg]}")
-            elif arg.annotation is not None:
-                new_params.append(f"{arg.arg}: {ast.unparse(arg.annotation)}")
-            else:
-                new_params.append(arg.arg)
-
-        # Build return annotation
-        return_hint = ""
-        if "return" in hints:
-            return_hint = f" -> {hints['return']}"
-        elif node.returns is not None:
-            return_hint = f" -> {ast.unparse(node.returns)}"
-
-        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
-        new_def = f"{prefix} {node.name}({', '.join(new_params)}){return_hint}:"
-
-        # Find the original def lines (may span multiple lines)
-        lines = source.splitlines(keepends=True)
-        start_idx = node.lineno - 1
-        end_idx = start_idx
-        paren_depth = 0
-        found_colon = False
-        for i in range(start_idx, len(lines)):
-            for ch in lines[i]:
-                if ch == '(':
-                    paren_depth += 1
-                elif ch == ')':
-                    paren_depth -= 1
-                elif ch == ':' and paren_depth == 0:
-                    found_colon = True
-                    break
-            if found_colon:
-                end_idx = i
-                break
-
-        indent = lines[start_idx][: len(lines[start_idx]) - len(lines[start_idx].lstrip())]
-        new_lines = lines[:start_idx] + [f"{indent}{new_def}\n"] + lines[end_idx + 1:]
-        patched_source = "".join(new_lines)
+def _find_header_colon(
+    node: ast.FunctionDef | ast.AsyncFunctionDef, lines: list[str]
+) -> tuple[int, int]:
+    """Return the (line index, column) of the ``:`` that closes *node*'s signature.
+
+    The search starts where the last signature element ends, per the AST
+    positions, so only the closing ``)``, commas and comments are left to skip.
+    """
+    a = node.args
+    elements: list[ast.expr | ast.arg] = [
+        *getattr(node, "type_params", []),
+        *a.posonlyargs, *a.args, *a.kwonlyargs, *a.defaults,
+        *(d for d in a.kw_defaults if d is not None),
+    ]
+    elements += [e for e in (a.vararg, a.kwarg, node.returns) if e is not None]
+
+    if elements:
+        end_line, byte_col = max(map(_end_position, elements))
+        row = end_line - 1
+    else:
+        row, byte_col = node.lineno - 1, node.col_offset
+    # AST columns are UTF-8 byte offsets; convert to a str index
+    col = len(lines[row].encode("utf-8")[:byte_col].decode("utf-8", errors="ignore"))
+
+    for i in range(row, len(lines)):
+        start = col if i == row else 0
+        idx = lines[i][start:].split("#", 1)[0].find(":")
+        if idx != -1:
+            return i, start + idx
+    return row, len(lines[row]) - 1
+
+
+def generate_type_hint_patch(func: FunctionInfo, hints: dict[str, str]) -> TypeHintPatch:
+    """Build a full source-level patch that inserts the inferred type hints."""
+    parsed = load_source(func.file_path)
+    source = parsed.source
 
+    node = parsed.func_index.get((func.name, func.line_number))
+    if node is None:
+        # Function not found — return unchanged source
         return TypeHintPatch(
             file_path=func.file_path,
             original_source=source,
-            patched_source=patched_source,
+            patched_source=source,
         )
 
-    # Function not found — return unchanged source
+    # Build new parameter list
+    new_params = []
+    for arg in node.args.args:
+        if arg.arg in ("self", "cls"):
+            new_params.append(arg.arg)
+        elif arg.arg in hints:
+            new_params.append(f"{arg.arg}: {hints[arg.arg]}")
+        elif arg.annotation is not None:
+            new_params.append(f"{arg.arg}: {ast.unparse(arg.annotation)}")
+        else:
+            new_params.append(arg.arg)
+
+    # Build return annotation
+    return_hint = ""
+    if "return" in hints:
+        return_hint = f" -> {hints['return']}"
+    elif node.returns is not None:
+        return_hint = f" -> {ast.unparse(node.returns)}"
+
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    new_def = f"{prefix} {node.name}({', '.join(new_params)}){return_hint}:"
+
+    # Find the original def lines (may span multiple lines)
+    lines = parsed.lines
+    start_idx = node.lineno - 1
+    end_idx, colon = _find_header_colon(node, lines)
+
+    indent = lines[start_idx][: len(lines[start_idx]) - len(lines[start_idx].lstrip())]
+    # Keep whatever follows the colon (a trailing comment or a one-line body)
+    tail = lines[end_idx][colon + 1:] or "\n"
+    replacement = f"{indent}{new_def}{tail}"
+    new_lines = lines[:start_idx] + [replacement] + lines[end_idx + 1:]
+    patched_source = "".join(new_lines)
+
     return TypeHintPatch(
         file_path=func.file_path,
         original_source=source,
-        patched_source=source,
+        patched_source=patched_source,
+        span=(start_idx, end_idx + 1),
+        replacement=replacement,
     )
 
 
 def apply_patches(patches: list[TypeHintPatch], dry_run: bool) -> list[str]:
     """Apply patches and return the modified source code strings.
 
-    Returns the list of patched source code strings.
+    Patches are grouped by file, so several functions in one file produce a
+    single combined source. Returns one patched source per distinct file, in
+    the order each file first appears in *patches*.
     """
-    return [patch.patched_source for patch in patches]
+    groups: dict[Path, list[TypeHintPatch]] = {}
+    for patch in patches:
+        groups.setdefault(patch.file_path, []).append(patch)
+
+    results: list[str] = []
+    for group in groups.values():
+        if len(group) == 1:
+            results.append(group[0].patched_source)
+            continue
+        # Splice bottom-up, in place, so earlier line numbers stay valid and
+        # the file is joined back into a string exactly once
+        lines = split_source_lines(group[0].original_source)
+        edits = sorted(
+            ((p.span, p.replacement) for p in group if p.span is not None),
+            key=lambda edit: edit[0], reverse=True,
+        )
+        for (start, end), replacement in edits:
+            lines[start:end] = [replacement]
+        results.append("".join(lines))
+    return results
 
 
 # ── Unit-test generation ─────────────────────────────────────────────
@@ -225,9 +327,13 @@ def generate_test_case(func: FunctionInfo) -> TestCase:
     pass
 
 
+_TEST_SUITE_TIMEOUT = 300.0  # seconds
+
+
 def generate_test_suite(source_code: str, filename: str) -> str:
     """Use the LLM to generate a complete pytest file for the provided source code."""
-    client = anthropic.Anthropic()
+    # Whole test files take far longer to generate than a single signature
+    client = _get_client().with_options(timeout=_TEST_SUITE_TIMEOUT)
     response = client.messages.create(
         model="claude-sonnet-4-5-20250929",
         max_tokens=4096,
@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
+
 from src.scanner import (
     build_project_context,
     scan_codebase,
 )
-from src.generator import apply_patches, generate_type_hint_patch, infer_type_hints
+from src.generator import (
+    apply_patches,
+    build_hint_prompt,
+    generate_type_hint_patch,
+    infer_type_hints,
+)
 
 mcp = FastMCP(
     name="TechDebtAssassin",
@@ -22,6 +33,15 @@ mcp = FastMCP(
 )
 
 _DEFAULT_EXCLUDE = {"venv", ".venv", "node_modules", "__pycache__", ".git", "tests"}
+# Concurrent inference requests per fix_file call; keep within API rate limits
+_MAX_INFERENCE_WORKERS = 8
+
+
+def _dumps(payload: dict, indent: bool = False) -> str:
+    """Serialize a tool response, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(payload, indent=2 if indent else None)
 
 
 @mcp.tool()
@@ -32,7 +52,8 @@ def scan_project(path: str) -> str:
         path: Path to a Python file or directory to scan.
 
     Returns:
-        JSON string with scan results including file count and missing hints.
+        JSON string with scan results including file count, missing hints and
+        any files that could not be parsed.
     """
     root = Path(path).resolve()
     result = scan_codebase(root, exclude_dirs=_DEFAULT_EXCLUDE)
@@ -48,11 +69,12 @@ def scan_project(path: str) -> str:
             "has_return_type": func.has_return_type,
         })
 
-    return json.dumps({
+    return _dumps({
         "files_scanned": result.files_scanned,
         "functions_at_risk": len(at_risk),
         "findings": findings,
-    }, indent=2)
+        "errors": [{"file": str(f), "error": msg} for f, msg in result.errors],
+    }, indent=True)
 
 
 @mcp.tool()
@@ -70,7 +92,15 @@ def fix_file(path: str) -> str:
     """
     file_path = Path(path).resolve()
     if not file_path.is_file() or file_path.suffix != ".py":
-        return json.dumps({"error": f"Not a valid Python file: {path}"})
+        return _dumps({"error": f"Not a valid Python file: {path}"})
+
+    result = scan_codebase(file_path, exclude_dirs=_DEFAULT_EXCLUDE)
+    if result.errors:
+        return _dumps({"error": f"Could not parse {path}: {result.errors[0][1]}"})
+    at_risk = result.functions_missing_hints
+
+    if not at_risk:
+        return _dumps({"message": "No missing type hints found.", "fixed": []})
 
     # Build project context from the file's parent directory
     project_root = file_path.parent
@@ -81,36 +111,38 @@ def fix_file(path: str) -> str:
             break
 
     project_context = build_project_context(str(project_root), exclude_dirs=_DEFAULT_EXCLUDE)
-
-    result = scan_codebase(file_path, exclude_dirs=_DEFAULT_EXCLUDE)
-    at_risk = result.functions_missing_hints
-
-    if not at_risk:
-        return json.dumps({"message": "No missing type hints found.", "fixed": []})
+    prompt = build_hint_prompt(project_context)
 
     fixed = []
     skipped = []
 
-    for func in at_risk:
-        hints = infer_type_hints(func, project_context=project_context)
+    # LLM calls are network-bound, so issue them concurrently over one client
+    with ThreadPoolExecutor(max_workers=min(_MAX_INFERENCE_WORKERS, len(at_risk))) as pool:
+        all_hints = list(pool.map(lambda f: infer_type_hints(f, prompt), at_risk))
+
+    patches = []
+    for func, hints in zip(at_risk, all_hints):
         if hints is None:
             skipped.append(func.name)
             continue
 
-        patch = generate_type_hint_patch(func, hints)
-        modified_sources = apply_patches([patch], dry_run=False)
-        patch.file_path.write_text(modified_sources[0])
+        patches.append(generate_type_hint_patch(func, hints))
         fixed.append({
             "function": func.name,
             "line": func.line_number,
             "hints": hints,
         })
 
-    return json.dumps({
+    # All patches target this one file: splice them together and write once
+    if patches:
+        modified_sources = apply_patches(patches, dry_run=False)
+        file_path.write_text(modified_sources[0])
+
+    return _dumps({
         "file": str(file_path),
         "fixed": fixed,
         "skipped": skipped,
-    }, indent=2)
+    }, indent=True)
 
 
 def run_server() -> None:
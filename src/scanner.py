@@ -4,12 +4,21 @@ from __future__ import annotations
 
 import ast
 import builtins as _builtins
+import functools
+import io
+import os
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TypeVar
+
+_T = TypeVar("_T")
 
 # Names that are valid to use in type annotations: all Python builtins
 # (int, float, str, list, dict, bool, …) plus common typing constructs.
-_KNOWN_TYPE_NAMES = set(dir(_builtins)) | {
+_KNOWN_TYPE_NAMES = frozenset(dir(_builtins)) | {
     "Any", "Optional", "Union", "List", "Dict", "Tuple", "Set",
     "FrozenSet", "Type", "Callable", "Iterator", "Generator",
     "Sequence", "Mapping", "Iterable", "Awaitable", "Coroutine",
@@ -45,7 +54,7 @@ def _is_valid_annotation(node: ast.expr) -> bool:
     return True
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionInfo:
     """Metadata about a single function/method found during scanning."""
 
@@ -56,13 +65,18 @@ class FunctionInfo:
     params_missing_hints: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """Aggregated result of scanning a codebase."""
 
     files_scanned: int = 0
     functions: list[FunctionInfo] = field(default_factory=list)
     force: bool = False
+    errors: list[tuple[Path, str]] = field(default_factory=list)
+    # Filled in once by scan_codebase so repeated reads don't re-filter
+    _missing: list[FunctionInfo] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def functions_missing_hints(self) -> list[FunctionInfo]:
@@ -73,11 +87,19 @@ class ScanResult:
         """
         if self.force:
             return list(self.functions)
-        return [
-            f
-            for f in self.functions
-            if f.params_missing_hints or not f.has_return_type
-        ]
+        if self._missing is not None:
+            return self._missing
+        return _filter_missing(self.functions)
+
+
+def _filter_missing(functions: list[FunctionInfo]) -> list[FunctionInfo]:
+    """Return the functions with a missing parameter or return annotation."""
+    out: list[FunctionInfo] = []
+    append = out.append
+    for f in functions:
+        if f.params_missing_hints or not f.has_return_type:
+            append(f)
+    return out
 
 
 _DEFAULT_EXCLUDE_DIRS = {"venv", ".venv", "node_modules", "__pycache__", ".git"}
@@ -104,13 +126,7 @@ def get_python_files(path: str, excluded_dirs: list[str] | None = None) -> list[
         return []
 
     skip = _DEFAULT_EXCLUDE_DIRS | set(excluded_dirs or [])
-    files: list[Path] = []
-    for child in sorted(target.rglob("*.py")):
-        rel_parts = child.relative_to(target).parts
-        if any(part in skip for part in rel_parts):
-            continue
-        files.append(child)
-    return files
+    return _walk_python_files(target, skip)
 
 
 def collect_python_files(root: Path, exclude_dirs: set[str] | None = None) -> list[Path]:
@@ -119,25 +135,109 @@ def collect_python_files(root: Path, exclude_dirs: set[str] | None = None) -> li
     if root.is_file():
         return [root] if root.suffix == ".py" else []
 
-    exclude = exclude_dirs or set()
+    return _walk_python_files(root, exclude_dirs or set())
+
+
+def _walk_python_files(root: Path, skip: set[str]) -> list[Path]:
+    """Return sorted ``.py`` files under *root*, never descending into *skip* dirs."""
     files: list[Path] = []
-    for path in sorted(root.rglob("*.py")):
-        if any(part in exclude for part in path.relative_to(root).parts):
-            continue
-        files.append(path)
+    stack = [str(root)]
+    while stack:
+        # DirEntry caches its type, so no extra stat per entry; excluded trees
+        # (venv, node_modules, ...) are never opened at all
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue  # unreadable directories are skipped, as Path.rglob does
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    files.append(Path(entry.path))
+    files.sort()
     return files
 
 
+# Only statements can contain a ``def``; expressions and annotations never do
+_DEF_CONTAINERS = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def iter_function_defs(tree: ast.AST) -> Iterator[ast.FunctionDef | ast.AsyncFunctionDef]:
+    """Yield every function/method in *tree* in the same breadth-first order as ``ast.walk``.
+
+    Unlike ``ast.walk`` it never descends into expression subtrees, which make
+    up the bulk of the nodes in a typical module.
+    """
+    queue: deque[ast.AST] = deque([tree])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node
+        queue.extend(c for c in ast.iter_child_nodes(node) if isinstance(c, _DEF_CONTAINERS))
+
+
+def split_source_lines(source: str) -> list[str]:
+    """Split *source* into lines, ends kept, numbered the way ``ast`` numbers them.
+
+    Only ``\\r\\n``, ``\\r`` and ``\\n`` end a line; ``str.splitlines`` also
+    breaks on form feeds, ``\\x1c``-``\\x1e``, ``\\x85`` and ``\\u2028``, which
+    would shift every later ``lineno``. A ``newline=""`` StringIO splits on
+    exactly the same endings and leaves them untranslated.
+    """
+    return list(io.StringIO(source, newline=""))
+
+
+@dataclass
+class ParsedSource:
+    """Source text of a file, shared by everything that inspects it.
+
+    The AST and the derived indexes are built on first access, so callers that
+    can rule a file out from its text alone never pay for ``ast.parse``.
+    """
+
+    path: str
+    source: str
+
+    @functools.cached_property
+    def tree(self) -> ast.Module:
+        return ast.parse(self.source, filename=self.path)
+
+    @functools.cached_property
+    def lines(self) -> list[str]:
+        return split_source_lines(self.source)
+
+    @functools.cached_property
+    def func_index(self) -> dict[tuple[str, int], ast.FunctionDef | ast.AsyncFunctionDef]:
+        index: dict[tuple[str, int], ast.FunctionDef | ast.AsyncFunctionDef] = {}
+        for node in iter_function_defs(self.tree):
+            index.setdefault((node.name, node.lineno), node)
+        return index
+
+
+@functools.lru_cache(maxsize=1024)
+def _load(path_str: str, mtime_ns: int, size: int) -> ParsedSource:
+    """Read a file once per (path, mtime, size) — edits change the key."""
+    return ParsedSource(path=path_str, source=Path(path_str).read_text(encoding="utf-8"))
+
+
+def load_source(file_path: Path) -> ParsedSource:
+    """Return the cached source and AST for *file_path*, re-parsing only if it changed."""
+    st = file_path.stat()
+    return _load(str(file_path), st.st_mtime_ns, st.st_size)
+
+
 def parse_function_signatures(file_path: Path) -> list[FunctionInfo]:
     """Parse a single Python file and return metadata for every function/method."""
-    source = file_path.read_text(encoding="utf-8")
-    tree = ast.parse(source, filename=str(file_path))
+    parsed = load_source(file_path)
+    # Every function needs the literal ``def`` keyword; skip the parse otherwise
+    if "def" not in parsed.source:
+        return []
+    tree = parsed.tree
 
     results: list[FunctionInfo] = []
-    for node in ast.walk(tree):
-        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            continue
-
+    for node in iter_function_defs(tree):
         missing_params: list[str] = []
         for arg in node.args.args:
             if arg.arg == "self" or arg.arg == "cls":
@@ -159,6 +259,48 @@ def parse_function_signatures(file_path: Path) -> list[FunctionInfo]:
     return results
 
 
+def _parse_or_error(file_path: Path) -> tuple[list[FunctionInfo], str | None]:
+    """Parse *file_path*, returning the error message instead of raising."""
+    try:
+        return parse_function_signatures(file_path), None
+    except (OSError, SyntaxError, ValueError) as exc:
+        return [], str(exc)
+
+
+# Below this many files, process start-up costs more than it saves
+_PARALLEL_MIN_FILES = 8
+
+
+def _map_files(fn: Callable[[Path], _T], files: list[Path]) -> list[_T]:
+    """Apply *fn* to every file, across a process pool for larger projects.
+
+    *fn* must be a module-level function so it can be pickled to workers.
+    Results are returned in the same order as *files*.
+    """
+    if len(files) < _PARALLEL_MIN_FILES:
+        return [fn(f) for f in files]
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, files, chunksize=chunksize))
+
+
+def _iter_map_files(fn: Callable[[Path], _T], files: list[Path], batch: int) -> Iterator[_T]:
+    """Like :func:`_map_files`, but yield results lazily, *batch* files at a time.
+
+    A consumer that stops early leaves every file past the current batch
+    unread.
+    """
+    if len(files) < _PARALLEL_MIN_FILES:
+        yield from map(fn, files)
+        return
+    workers = os.cpu_count() or 1
+    chunksize = max(1, batch // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(files), batch):
+            yield from pool.map(fn, files[start:start + batch], chunksize=chunksize)
+
+
 def _build_file_tree(root: Path, py_files: list[Path]) -> str:
     """Build a textual file-tree representation of the project."""
     lines: list[str] = [f"{root.name}/"]
@@ -173,14 +315,19 @@ def _build_file_tree(root: Path, py_files: list[Path]) -> str:
 def _extract_file_summary(file_path: Path) -> str:
     """Extract class names, function signatures, and docstrings from a .py file."""
     try:
-        source = file_path.read_text(encoding="utf-8")
+        parsed = load_source(file_path)
     except Exception:
         return f"# {file_path.name}: (could not read)\n"
+    source = parsed.source
+    if "def" not in source and "class" not in source:
+        return "# (no classes or functions)"
 
     try:
-        tree = ast.parse(source, filename=str(file_path))
-    except SyntaxError:
+        tree = parsed.tree
+    except (SyntaxError, ValueError):
         return f"# {file_path.name}: (syntax error)\n"
+    # Index the def lines directly; get_source_segment re-splits the source per call
+    lines = parsed.lines
 
     parts: list[str] = []
     for node in ast.iter_child_nodes(tree):
@@ -191,18 +338,9 @@ def _extract_file_summary(file_path: Path) -> str:
                 parts.append(f'    """{docstring}"""')
             for item in node.body:
                 if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    sig = ast.get_source_segment(source, item)
-                    if sig:
-                        def_line = sig.split("\n")[0]
-                        parts.append(f"    {def_line}")
-                    else:
-                        parts.append(f"    def {item.name}(...):")
+                    parts.append(f"    {lines[item.lineno - 1].strip()}")
         elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            sig = ast.get_source_segment(source, node)
-            if sig:
-                parts.append(sig.split("\n")[0])
-            else:
-                parts.append(f"def {node.name}(...):")
+            parts.append(lines[node.lineno - 1].strip())
             docstring = ast.get_docstring(node)
             if docstring:
                 parts.append(f'    """{docstring}"""')
@@ -214,6 +352,47 @@ def _extract_file_summary(file_path: Path) -> str:
 _CHARS_PER_TOKEN = 4
 _MAX_CONTEXT_TOKENS = 200_000  # conservative limit for Opus 4.6's 1M window
 _FULL_BODY_TOKEN_BUDGET = 100_000
+_SUMMARY_BATCH_FILES = 256  # files summarised ahead of the budget check
+
+
+class _BoundedWriter:
+    """Newline-joined text buffer that stops accepting input after *limit* chars."""
+
+    def __init__(self, limit: int) -> None:
+        self._buf = io.StringIO()
+        self._remaining = limit
+        self.truncated = False
+
+    def write(self, text: str) -> bool:
+        """Append *text* as a new line; return False once the budget is spent."""
+        if self._buf.tell():
+            text = "\n" + text
+        if len(text) > self._remaining:
+            self._buf.write(text[: self._remaining])
+            self._remaining = 0
+            self.truncated = True
+            return False
+        self._buf.write(text)
+        self._remaining -= len(text)
+        return True
+
+    def getvalue(self) -> str:
+        return self._buf.getvalue()
+
+
+def _read_body(file_path: Path) -> str:
+    """Return the full source of *file_path* for full-body context mode."""
+    try:
+        return file_path.read_text(encoding="utf-8")
+    except Exception:
+        return "# (could not read)"
+
+
+# (root, excluded dirs) -> ((file paths, newest mtime, total size), context)
+_CTX_CACHE: OrderedDict[
+    tuple[str, frozenset[str]], tuple[tuple[tuple[Path, ...], int, int], str]
+] = OrderedDict()
+_CTX_CACHE_SIZE = 8
 
 
 def build_project_context(root_path: str, exclude_dirs: set[str] | None = None) -> str:
@@ -222,6 +401,9 @@ def build_project_context(root_path: str, exclude_dirs: set[str] | None = None)
     Includes file tree and per-file summaries (class names, function signatures,
     docstrings). If the total project source is under 100k tokens, includes full
     file bodies instead of summaries. Truncates gracefully if too large.
+
+    Results are memoized per project and reused until a file is added,
+    removed, renamed, or modified.
     """
     root = Path(root_path).resolve()
     skip = (_DEFAULT_EXCLUDE_DIRS | (exclude_dirs or set())) | {"tests"}
@@ -230,46 +412,57 @@ def build_project_context(root_path: str, exclude_dirs: set[str] | None = None)
     if not py_files:
         return "# Empty project — no Python files found."
 
-    # Check total source size to decide full-body vs summary mode
-    total_chars = 0
-    file_sources: dict[Path, str] = {}
-    for f in py_files:
-        try:
-            src = f.read_text(encoding="utf-8")
-            file_sources[f] = src
-            total_chars += len(src)
-        except Exception:
-            file_sources[f] = ""
-
-    use_full_body = (total_chars // _CHARS_PER_TOKEN) < _FULL_BODY_TOKEN_BUDGET
+    stats = [f.stat() for f in py_files]
+    total_chars = sum(st.st_size for st in stats)
+    # The paths themselves are part of the signature: a rename keeps the
+    # count, mtimes and sizes, but changes the file tree in the context
+    signature = (tuple(py_files), max(st.st_mtime_ns for st in stats), total_chars)
+    key = (str(root), frozenset(skip))
+    cached = _CTX_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        _CTX_CACHE.move_to_end(key)
+        return cached[1]
+
+    context = _render_project_context(root, py_files, total_chars)
+    _CTX_CACHE[key] = (signature, context)
+    _CTX_CACHE.move_to_end(key)
+    if len(_CTX_CACHE) > _CTX_CACHE_SIZE:
+        _CTX_CACHE.popitem(last=False)
+    return context
 
-    # Build the context
-    sections: list[str] = []
-    sections.append("=" * 60)
-    sections.append("PROJECT STRUCTURE")
-    sections.append("=" * 60)
-    sections.append(_build_file_tree(root, py_files))
-    sections.append("")
 
-    sections.append("=" * 60)
-    sections.append("FILE DETAILS")
-    sections.append("=" * 60)
+def _render_project_context(root: Path, py_files: list[Path], total_chars: int) -> str:
+    """Render the context text for :func:`build_project_context`."""
+    # Decide full-body vs summary mode from file sizes, without reading bodies
+    use_full_body = (total_chars // _CHARS_PER_TOKEN) < _FULL_BODY_TOKEN_BUDGET
 
-    for f in py_files:
-        rel = f.relative_to(root)
-        sections.append(f"\n--- {rel} ---")
+    # Build the context, stopping as soon as the budget is spent
+    out = _BoundedWriter(_MAX_CONTEXT_TOKENS * _CHARS_PER_TOKEN)
+    header = [
+        "=" * 60,
+        "PROJECT STRUCTURE",
+        "=" * 60,
+        _build_file_tree(root, py_files),
+        "",
+        "=" * 60,
+        "FILE DETAILS",
+        "=" * 60,
+    ]
+    if all(out.write(line) for line in header):
+        bodies: Iterator[str]
         if use_full_body:
-            sections.append(file_sources.get(f, "# (could not read)"))
+            bodies = map(_read_body, py_files)
         else:
-            sections.append(_extract_file_summary(f))
-
-    context = "\n".join(sections)
-
-    # Truncate if exceeding max context budget
-    max_chars = _MAX_CONTEXT_TOKENS * _CHARS_PER_TOKEN
-    if len(context) > max_chars:
-        context = context[:max_chars] + "\n\n... [TRUNCATED — project context exceeded token budget]"
-
+            # Summaries are parsed a batch ahead of the writer, so files past
+            # the budget are never read
+            bodies = _iter_map_files(_extract_file_summary, py_files, _SUMMARY_BATCH_FILES)
+        for f, body in zip(py_files, bodies):
+            if not (out.write(f"\n--- {f.relative_to(root)} ---") and out.write(body)):
+                break
+
+    context = out.getvalue()
+    if out.truncated:
+        context += "\n\n... [TRUNCATED — project context exceeded token budget]"
     return context
 
 
@@ -278,9 +471,15 @@ def scan_codebase(root: Path, exclude_dirs: set[str] | None = None, force: bool
 
     When *force* is True every function is reported, even those that already
     have complete type hints, so that hints can be overwritten.
+
+    Files that cannot be read or parsed are recorded in ``errors`` instead of
+    aborting the whole scan.
     """
     files = collect_python_files(root, exclude_dirs)
     result = ScanResult(files_scanned=len(files), force=force)
-    for f in files:
-        result.functions.extend(parse_function_signatures(f))
+    for f, (infos, error) in zip(files, _map_files(_parse_or_error, files)):
+        if error is not None:
+            result.errors.append((f, error))
+        result.functions.extend(infos)
+    result._missing = _filter_missing(result.functions)
     return result
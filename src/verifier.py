@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
+import ast
+import atexit
+import contextlib
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
 import py_compile
+import re
+import shlex
+import shutil
 import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
-from src.generator import TestCase, TypeHintPatch
+from src.generator import TestCase, TypeHintPatch, apply_patches
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerificationResult:
     """Outcome of verifying a single patch or test file."""
 
@@ -19,45 +34,711 @@ class VerificationResult:
     errors: list[str]
 
 
+# Trim pytest's per-session setup: no .pytest_cache I/O, no doctest collection,
+# no sys.path insertion and no assertion-rewrite cache
+_PYTEST_ARGS = [
+    "-p", "no:cacheprovider",
+    "-p", "no:doctest",
+    "--import-mode=importlib",
+    "--assert=plain",
+    "-q",
+    "--no-header",
+]
+
+
+def _pytest_main(args: list[str], plugins: list[object] | None = None) -> int:
+    """Run pytest in-process without auto-loading third-party plugins.
+
+    Plugins the verifier needs (e.g. xdist) are requested explicitly with ``-p``.
+    pytest's terminal report is sent to ``os.devnull`` rather than buffered;
+    callers read outcomes from the exit code or a plugin, and the report
+    would otherwise land in the CLI's output.
+    """
+    import pytest  # dev dependency; only needed once verification runs
+
+    previous = os.environ.get("PYTEST_DISABLE_PLUGIN_AUTOLOAD")
+    os.environ["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = "1"
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return pytest.main([*args, *_PYTEST_ARGS], plugins=plugins)
+    finally:
+        if previous is None:
+            del os.environ["PYTEST_DISABLE_PLUGIN_AUTOLOAD"]
+        else:
+            os.environ["PYTEST_DISABLE_PLUGIN_AUTOLOAD"] = previous
+
+
 def run_pytest(test_file: str) -> bool:
-    """Run pytest on *test_file* and return True if all tests pass."""
-    result = subprocess.run(
-        ["pytest", test_file],
-        capture_output=True,
-        text=True,
-    )
-    return result.returncode == 0
+    """Run pytest on *test_file* and return True if all tests pass.
+
+    pytest runs in-process so repeated calls skip interpreter startup and the
+    plugin import.
+    """
+    return _pytest_main([test_file]) == 0
+
+
+class _ReportCollector:
+    """pytest plugin that buckets test outcomes by the module they came from."""
+
+    def __init__(self) -> None:
+        self.seen: set[str] = set()
+        self.errors: dict[str, list[str]] = {}
+
+    def _record(self, report) -> None:
+        name = Path(report.fspath).name
+        self.seen.add(name)
+        if report.failed:
+            detail = [ln.strip() for ln in report.longreprtext.splitlines() if ln.strip()]
+            summary = detail[-1] if detail else report.outcome
+            self.errors.setdefault(name, []).append(f"{report.nodeid}: {summary}")
+
+    def pytest_runtest_logreport(self, report) -> None:
+        self._record(report)
+
+    def pytest_collectreport(self, report) -> None:
+        if report.failed:
+            self._record(report)
+
+
+# xdist worker startup costs seconds, so small batches run in a single process
+_XDIST_MIN_FILES = 3
+
+
+def _xdist_args(n_files: int) -> list[str]:
+    """Return ``-n`` arguments for pytest-xdist, or none when it would not pay off."""
+    # Leave two cores for the verifier itself and a concurrent mypy run; a
+    # single worker would pay xdist's startup for no parallelism
+    workers = (os.cpu_count() or 1) - 2
+    if n_files < _XDIST_MIN_FILES or workers < 2 or importlib.util.find_spec("xdist") is None:
+        return []
+    return ["-p", "xdist.plugin", "-n", str(workers)]
+
+
+def _forget_modules(preloaded: set[str], dirs: set[str]) -> None:
+    """Drop modules imported from *dirs* since *preloaded* was taken.
+
+    Tests run in this process, so without this a later run would see the
+    module objects, and hence the source, from an earlier one.
+    """
+    roots = tuple(os.path.join(d, "") for d in dirs)
+    for name in set(sys.modules) - preloaded:
+        if (getattr(sys.modules[name], "__file__", None) or "").startswith(roots):
+            del sys.modules[name]
+
+
+# pytest exit codes after which the per-file outcomes are complete: all passed,
+# some failed, or nothing to collect
+_COMPLETE_EXIT_CODES = frozenset({0, 1, 5})
+
+
+def _run_pytest_batch(
+    test_files: list[Path], pythonpath: list[str] | None = None,
+) -> tuple[dict[Path, list[str]], bool]:
+    """Run every file in *test_files* in one pytest session; map each to its errors.
+
+    Also returns whether the session ran to completion; outcomes of an
+    interrupted or misconfigured session must not be cached. *pythonpath*
+    directories are put on ``sys.path`` for the session (and any xdist
+    workers). Files are told apart by name, so callers must pass uniquely
+    named files.
+    """
+    # One broken file must not stop the other files in the batch from running
+    args = [
+        *map(str, test_files),
+        "--continue-on-collection-errors",
+        *_xdist_args(len(test_files)),
+    ]
+    if pythonpath:
+        args += ["-o", "pythonpath=" + " ".join(map(shlex.quote, pythonpath))]
+
+    collector = _ReportCollector()
+    preloaded = set(sys.modules)
+    try:
+        exit_code = _pytest_main(args, plugins=[collector])
+    finally:
+        dirs = {*(pythonpath or ()), *(str(f.resolve().parent) for f in test_files)}
+        _forget_modules(preloaded, dirs)
+
+    complete = exit_code in _COMPLETE_EXIT_CODES
+    outcomes: dict[Path, list[str]] = {}
+    for f in test_files:
+        if f.name in collector.seen:
+            outcomes[f] = collector.errors.get(f.name, [])
+        elif complete:
+            outcomes[f] = ["no tests collected"]
+        else:
+            outcomes[f] = [f"pytest session aborted (exit status {int(exit_code)})"]
+    return outcomes, complete
+
+
+def _is_simple_test_module(tree: ast.Module) -> bool:
+    """Return True if every test in *tree* is a plain callable needing no pytest machinery.
+
+    That rules out fixtures, marks and parametrisation (any decorator), test
+    functions taking arguments, generator and async tests, classes of any
+    name (``unittest.TestCase`` subclasses are collected whatever they are
+    called), xunit ``setup_*``/``teardown_*`` hooks, ``pytestmark``,
+    ``pytest_plugins`` and any pytest API besides ``pytest.raises``
+    (``skip``, ``importorskip``, ``fail`` and friends).
+    """
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)
+                and node.value.id == "pytest" and node.attr != "raises"):
+            return False
+        if (isinstance(node, ast.ImportFrom) and node.module == "pytest"
+                and any(alias.name != "raises" for alias in node.names)):
+            return False
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            return False
+        if any(_XUNIT_HOOK_RE.match(name) for name in _bound_names(node)):
+            return False
+        if isinstance(node, ast.AsyncFunctionDef):
+            return False
+        if isinstance(node, ast.FunctionDef):
+            args = node.args
+            if node.decorator_list:
+                return False
+            if node.name.startswith("test") and (
+                args.posonlyargs or args.args or args.vararg or args.kwonlyargs or args.kwarg
+            ):
+                return False
+            if node.name.startswith("test") and any(
+                isinstance(n, (ast.Yield, ast.YieldFrom)) for n in ast.walk(node)
+            ):
+                return False
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if any(isinstance(t, ast.Name) and t.id in ("pytestmark", "pytest_plugins")
+                   for t in targets):
+                return False
+    return True
+
+
+# Module-level xunit hooks pytest calls around tests: setup_module, teardown_function, ...
+_XUNIT_HOOK_RE = re.compile(r"^(?:setup|teardown)(?:_|$)|^(?:setUp|tearDown)Module$")
+
+
+def _bound_names(node: ast.stmt) -> list[str]:
+    """Return the module-level names a top-level statement *node* binds."""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [alias.asname or alias.name.split(".")[0] for alias in node.names]
+    if isinstance(node, (ast.Assign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return [t.id for t in targets if isinstance(t, ast.Name)]
+    return []
+
+
+def _has_conftest(test_file: Path) -> bool:
+    """Return True if a ``conftest.py`` beside or above *test_file* could affect it.
+
+    Every ancestor directory is checked: pytest's rootdir is at or above the
+    file, so this covers every conftest it could load, and a false positive
+    only costs a pytest run.
+    """
+    return any((d / "conftest.py").exists() for d in test_file.resolve().parents)
+
+
+def _describe(exc: BaseException) -> str:
+    """Format *exc* as ``Type: message``, or just ``Type`` when it has no message."""
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+
+
+def _run_simple_tests(test_file: Path, pythonpath: list[str] | None = None) -> list[str] | None:
+    """Call the tests in *test_file* directly, or return None if it needs pytest.
+
+    Skipping pytest's collection and plugin setup makes plain assertion
+    files, the common shape of generated tests, nearly free to run.
+    *pythonpath* directories are on ``sys.path`` while the tests run, and
+    their output is discarded, as pytest captures it.
+    """
+    if _has_conftest(test_file):
+        return None
+    try:
+        tree = ast.parse(test_file.read_bytes(), filename=str(test_file))
+    except (OSError, SyntaxError, ValueError):
+        return None  # let pytest report it as a collection error
+    if not _is_simple_test_module(tree):
+        return None
+
+    import pytest  # dev dependency; only needed once verification runs
+
+    # pytest's skip and fail outcomes, like SystemExit, derive from
+    # BaseException; a helper can still raise them from an otherwise plain
+    # test, so they get pytest's treatment rather than escaping
+    skipped = pytest.skip.Exception
+    failures = (Exception, SystemExit, pytest.fail.Exception)
+
+    spec = importlib.util.spec_from_file_location(f"_verify_{test_file.stem}", test_file)
+    if spec is None or spec.loader is None:
+        return None
+    loader = spec.loader
+    module = importlib.util.module_from_spec(spec)
+    extra_paths = [d for d in pythonpath or () if d not in sys.path]
+    sys.path[:0] = extra_paths
+    preloaded = set(sys.modules)
+    errors: list[str] = []
+    # Test output is discarded, as pytest's capture would keep it off the CLI
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+            contextlib.redirect_stderr(devnull):
+        try:
+            try:
+                loader.exec_module(module)
+            except skipped:
+                return []  # pytest skips the whole module, which is not a failure
+            except failures as exc:
+                return [f"{test_file.name}: {_describe(exc)}"]
+
+            tests = [
+                (name, fn) for name, fn in vars(module).items()
+                if name.startswith("test") and inspect.isfunction(fn)
+                and fn.__module__ == module.__name__
+            ]
+            if not tests:
+                return ["no tests collected"]
+            for name, fn in tests:
+                try:
+                    fn()
+                except skipped:
+                    continue
+                except failures as exc:
+                    errors.append(f"{test_file.name}::{name}: {_describe(exc)}")
+        finally:
+            for d in extra_paths:
+                sys.path.remove(d)
+            _forget_modules(preloaded, {*(pythonpath or ()), str(test_file.resolve().parent)})
+    return errors
+
+
+# Kept apart from the project's own .mypy_cache so verifier runs never clobber it
+_MYPY_CACHE_DIR = ".mypy_cache_verifier"
+
+
+def _mypy_cache_args(cache_dir: str) -> list[str]:
+    """Return arguments that make mypy reuse results from earlier runs in *cache_dir*."""
+    return ["--incremental", f"--cache-dir={cache_dir}", "--sqlite-cache"]
+
+
+# Status file of the mypy daemon that run_mypy keeps warm between calls
+_DMYPY_STATUS_FILE = ".dmypy_verifier.json"
+
 
+def _dmypy(*args: str) -> list[str]:
+    """Return a ``dmypy`` command line bound to the verifier's daemon."""
+    return ["dmypy", "--status-file", _DMYPY_STATUS_FILE, *args]
 
-def run_mypy(source_file: str) -> bool:
-    """Run mypy on *source_file* and return True if no type errors are found."""
+
+# Status files of daemons run_mypy has started; each is stopped at exit
+_started_daemons: set[str] = set()
+
+
+def run_mypy(source_file: str, cache_dir: str = _MYPY_CACHE_DIR) -> bool:
+    """Run mypy on *source_file* and return True if no type errors are found.
+
+    Checks go through the mypy daemon, which ``dmypy run`` starts on first
+    use, so later calls skip mypy's startup and reuse its in-memory state.
+    Call :func:`stop_mypy_daemon` once done; the daemon is also stopped when
+    the interpreter exits, so a caller that forgets does not leak it.
+    """
+    if _DMYPY_STATUS_FILE not in _started_daemons:
+        _started_daemons.add(_DMYPY_STATUS_FILE)
+        atexit.register(
+            subprocess.run, _dmypy("stop"), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
     result = subprocess.run(
-        ["mypy", source_file, "--ignore-missing-imports"],
-        capture_output=True,
-        text=True,
+        _dmypy("run", "--", "--ignore-missing-imports", *_mypy_cache_args(cache_dir), source_file),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     return result.returncode == 0
 
 
+def stop_mypy_daemon() -> None:
+    """Shut down the daemon started by :func:`run_mypy`, if it is running."""
+    subprocess.run(_dmypy("stop"), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
 def verify_syntax(file_path: Path) -> VerificationResult:
-    """Check that a Python file is syntactically valid (compile check)."""
+    """Check that a Python file is syntactically valid (in-process parse check).
+
+    Results for recently checked files are cached until the file changes, so
+    repeated checks of an unchanged file parse it only once.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError as exc:
+        return VerificationResult(path=file_path, passed=False, errors=[str(exc)])
+    return _cached_syntax(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_syntax(path_str: str, mtime_ns: int, size: int) -> VerificationResult:
+    """Check a file once per (path, mtime, size) — edits change the key."""
+    return _check_syntax(Path(path_str))
+
+
+def _check_syntax(file_path: Path) -> VerificationResult:
+    """Parse *file_path* and report any syntax error.
+
+    Only the AST is built: the compiler's later passes add nothing that a
+    type-hint patch could break, and mypy covers them anyway.
+    """
     try:
-        py_compile.compile(str(file_path), doraise=True)
-        return VerificationResult(path=file_path, passed=True, errors=[])
-    except py_compile.PyCompileError as exc:
+        # Bytes let the parser honour any PEP 263 encoding declaration
+        ast.parse(file_path.read_bytes(), filename=str(file_path))
+    except SyntaxError as exc:
+        return VerificationResult(
+            path=file_path, passed=False, errors=[f"{exc.msg} at line {exc.lineno}"],
+        )
+    except (OSError, ValueError) as exc:
         return VerificationResult(path=file_path, passed=False, errors=[str(exc)])
+    return VerificationResult(path=file_path, passed=True, errors=[])
 
 
-def verify_type_hints(file_path: Path) -> VerificationResult:
+# Line and column are optional: file-level diagnostics such as duplicate modules
+# are reported as ``path: error: ...``
+_MYPY_ERR_RE = re.compile(r"^(.+?):(?:(\d+):(?:\d+:)?)? (error|note): (.+)$")
+
+
+def _parse_mypy_line(line: str) -> tuple[str, int | None, str, str] | None:
+    """Split a mypy diagnostic into ``(path, line_no, level, message)``, or None."""
+    match = _MYPY_ERR_RE.match(line.rstrip("\n"))
+    if match is None:
+        return None
+    path, line_no, level, message = match.groups()
+    return path, int(line_no) if line_no else None, level, message
+
+
+def _run_mypy_batch(
+    source_files: list[Path],
+    cache_dir: str = _MYPY_CACHE_DIR,
+    search_path: list[str] | None = None,
+) -> dict[Path, list[str]]:
+    """Type-check every file in one mypy run; map each (resolved) path to its errors.
+
+    Syntax errors come back too, tagged ``[syntax]`` by mypy. They stop mypy
+    before it type-checks anything else, so the other files are then
+    checked by a second run. *search_path* directories are passed to mypy
+    as ``MYPYPATH`` for resolving imports of modules not being checked.
+    A failed run whose errors cannot be pinned on a file fails every file.
+    """
+    paths = list(dict.fromkeys(f.resolve() for f in source_files))
+
+    # Same-named files would clash as duplicate modules, and errors are matched
+    # back to files by name below, so each name gets a run of its own
+    batch: dict[str, Path] = {}
+    for p in paths:
+        batch.setdefault(p.name, p)
+    if len(batch) < len(paths):
+        rest = [p for p in paths if batch[p.name] != p]
+        return {
+            **_run_mypy_batch(list(batch.values()), cache_dir, search_path),
+            **_run_mypy_batch(rest, cache_dir, search_path),
+        }
+
+    errors: dict[Path, list[str]] = {p: [] for p in paths}
+    unattributed: list[str] = []
+    unparsable: set[Path] = set()
+
+    # Parse output as it streams so memory stays flat however much mypy prints
+    with subprocess.Popen(
+        [
+            "mypy",
+            "--ignore-missing-imports",
+            "--no-error-summary",
+            "--show-absolute-path",
+            *_mypy_cache_args(cache_dir),
+            *map(str, paths),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env={**os.environ, "MYPYPATH": os.pathsep.join(search_path)} if search_path else None,
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            # Cheap substring test first; most non-error output never hits the regex
+            if "error:" not in line:
+                continue
+            parsed = _parse_mypy_line(line)
+            if parsed is None:
+                unattributed.append(line.strip())
+                continue
+            path, lineno, _, message = parsed
+            key = Path(path)
+            if key not in errors:
+                # Errors replayed from the incremental cache keep the path of the
+                # file that first produced them; names are unique in this run
+                key = batch.get(key.name, key)
+            if key not in errors:
+                unattributed.append(line.strip())
+                continue
+            errors[key].append(f"line {lineno}: {message}" if lineno else message)
+            if message.endswith("[syntax]"):
+                unparsable.add(key)
+
+    if proc.returncode != 0 and not any(errors.values()):
+        reason = unattributed or [f"mypy exited with status {proc.returncode}"]
+        return {p: list(reason) for p in paths}
+
+    rest = [p for p in paths if p not in unparsable]
+    if unparsable and rest and proc.returncode == 2:
+        errors.update(_run_mypy_batch(rest, cache_dir, search_path))
+    return errors
+
+
+def verify_type_hints(file_path: Path, cache_dir: str = _MYPY_CACHE_DIR) -> VerificationResult:
     """Run mypy on a single file and report any type errors."""
-    pass
+    errors = _run_mypy_batch([file_path], cache_dir)[file_path.resolve()]
+    return VerificationResult(path=file_path, passed=not errors, errors=errors)
 
 
 def verify_tests(test_file: Path) -> VerificationResult:
-    """Execute a test file with pytest and report pass/fail."""
-    pass
+    """Execute a test file and report pass/fail."""
+    return verify_test_files([test_file])[0]
+
+
+def verify_test_files(
+    test_files: list[Path], pythonpath: list[str] | None = None,
+) -> list[VerificationResult]:
+    """Execute several test files and report pass/fail for each, in order.
+
+    Files of plain assertion tests are run by calling each test directly.
+    The rest share one pytest session, so pytest's configuration and plugin
+    setup is paid once per batch rather than once per file. *pythonpath*
+    directories, typically those of the modules under test, are importable
+    while the tests run.
+    """
+    errors: dict[Path, list[str]] = {}
+    pending: list[Path] = []
+    for f in dict.fromkeys(test_files):
+        if not f.is_file():
+            errors[f] = ["test file not found"]
+            continue
+        simple = _run_simple_tests(f, pythonpath)
+        if simple is None:
+            pending.append(f)
+        else:
+            errors[f] = simple
+
+    # Sessions tell files apart by name, so same-named files wait for the next one
+    while pending:
+        batch: dict[str, Path] = {}
+        rest: list[Path] = []
+        for f in pending:
+            if f.name in batch:
+                rest.append(f)
+            else:
+                batch[f.name] = f
+        errors.update(_run_pytest_batch(list(batch.values()), pythonpath)[0])
+        pending = rest
+
+    return [VerificationResult(path=f, passed=not errors[f], errors=errors[f]) for f in test_files]
+
+
+# Outcomes of earlier test-case runs, keyed on a hash of everything they depend on
+_RESULT_CACHE_DIR = Path(".assassin_cache") / "verify"
+
+
+def _result_cache_key(tc: TestCase, module_file: Path) -> str | None:
+    """Hash the test code, the source it exercises and the pytest version."""
+    import pytest  # dev dependency; only needed once verification runs
+
+    try:
+        source = module_file.read_bytes()
+    except OSError:
+        return None
+    digest = hashlib.sha1(tc.test_code.encode())
+    for part in (source, pytest.__version__.encode()):
+        digest.update(b"\0")
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _import_root(path: Path) -> Path:
+    """Return the directory *path* is imported from: the one above its outermost package."""
+    root = path.parent
+    while (root / "__init__.py").exists():
+        root = root.parent
+    return root
+
+
+def _non_python(directory: str, names: list[str]) -> set[str]:
+    """``copytree`` filter keeping only Python sources, stubs and the directories holding them."""
+    return {
+        name for name in names
+        if name == "__pycache__"
+        or not (name.endswith((".py", ".pyi")) or os.path.isdir(os.path.join(directory, name)))
+    }
+
+
+def _stage_patched_sources(patches: list[TypeHintPatch], stage_dir: Path) -> dict[Path, Path]:
+    """Write each patched file once under *stage_dir*; map original (resolved) path to copy.
+
+    Files keep their path relative to their import root, and files sharing
+    an import root share a staging directory. A file inside a package is
+    staged with a copy of its whole top-level package, so absolute and
+    relative imports of its siblings resolve within the staged tree; only
+    its Python files are copied, not data files.
+    """
+    files = [f.resolve() for f in dict.fromkeys(p.file_path for p in patches)]
+    roots: dict[Path, Path] = {}
+    staged: dict[Path, Path] = {}
+    for original in files:
+        root = _import_root(original)
+        target_root = roots.get(root)
+        if target_root is None:
+            target_root = roots[root] = stage_dir / str(len(roots))
+            target_root.mkdir()
+        relative = original.relative_to(root)
+        package = relative.parts[0]
+        if len(relative.parts) > 1 and not (target_root / package).exists():
+            shutil.copytree(root / package, target_root / package, ignore=_non_python)
+        staged[original] = target_root / relative
+    for original, source in zip(files, apply_patches(patches, dry_run=True)):
+        staged[original].write_bytes(source.encode())
+    return staged
+
+
+def _run_test_cases(
+    test_cases: list[TestCase],
+    staged: dict[Path, Path] | None = None,
+    cache_dir: Path | None = None,
+) -> list[VerificationResult]:
+    """Materialise *test_cases* as modules and run them in one pytest session.
+
+    Modules with a *staged* patched copy are imported from it, ahead of the
+    originals. With a *cache_dir*, test cases whose code and module source
+    are unchanged since an earlier run reuse that run's outcome instead of
+    executing again.
+    """
+    staged = staged or {}
+    originals = [tc.source_file.resolve() for tc in test_cases]
+    modules = [staged.get(f, f) for f in originals]
+    keys = [
+        _result_cache_key(tc, module) if cache_dir else None
+        for tc, module in zip(test_cases, modules)
+    ]
+    # No key (the module could not be read) means no cache entry at all
+    cache_files = [
+        cache_dir / f"{key}.json" if cache_dir is not None and key is not None else None
+        for key in keys
+    ]
+    outcomes: list[list[str] | None] = [None] * len(test_cases)
+    for i, cache_file in enumerate(cache_files):
+        if cache_file is None:
+            continue
+        try:
+            outcomes[i] = json.loads(cache_file.read_text())["errors"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    pending = [i for i, errors in enumerate(outcomes) if errors is None]
+    if pending:
+        with tempfile.TemporaryDirectory() as tmp:
+            test_files = {}
+            for i in pending:
+                tc = test_cases[i]
+                test_file = Path(tmp) / f"test_{i}_{tc.source_file.stem}_{tc.function_name}.py"
+                test_file.write_text(tc.test_code)
+                test_files[i] = test_file
+
+            # Generated tests import the module under test by name or through
+            # its package; staged copies come first, unpatched neighbours
+            # from the original tree
+            source_dirs = list(dict.fromkeys([
+                *(str(_import_root(modules[i])) for i in pending),
+                *(str(modules[i].parent) for i in pending),
+                *(str(_import_root(originals[i])) for i in pending),
+                *(str(originals[i].parent) for i in pending),
+            ]))
+            fresh, complete = _run_pytest_batch(list(test_files.values()), pythonpath=source_dirs)
+
+        for i, test_file in test_files.items():
+            outcomes[i] = errors = fresh[test_file]
+            cache_file = cache_files[i]
+            if cache_file is None or not complete:
+                continue
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(json.dumps({"passed": not errors, "errors": errors}))
+            except OSError:
+                pass  # a cache we cannot write only costs a rerun next time
+
+    results = []
+    for tc, outcome in zip(test_cases, outcomes):
+        assert outcome is not None  # every test case is cached or ran above
+        results.append(VerificationResult(path=tc.source_file, passed=not outcome, errors=outcome))
+    return results
+
+
+def verify_all(
+    patches: list[TypeHintPatch],
+    test_cases: list[TestCase],
+    mypy_cache_dir: str = _MYPY_CACHE_DIR,
+    result_cache_dir: Path | None = _RESULT_CACHE_DIR,
+) -> list[VerificationResult]:
+    """Run the full verification pipeline over all generated artefacts.
+
+    Returns one result per patch followed by one per test case. The patched
+    sources are written once to a staging directory that both tools read,
+    so nothing is verified against stale files on disk. Patched files are
+    parsed and type-checked by a single mypy run (there is no separate
+    :func:`verify_syntax` pass) and test cases run in batched pytest
+    sessions, so tool startup is paid once per batch rather than per file.
+
+    Test cases for a patched file only run once its patch passes mypy;
+    otherwise they are reported as skipped. Test cases for unpatched files
+    do not depend on mypy, so they run while mypy works in the background.
+    Test outcomes are cached under *result_cache_dir*; pass ``None`` to
+    always rerun them.
+    """
+    test_results: list[VerificationResult | None] = [None] * len(test_cases)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        staged = _stage_patched_sources(patches, Path(tmp))
+        # Unpatched neighbours stay importable for mypy from the original tree
+        search_path = list(dict.fromkeys(
+            d for f in staged for d in (str(_import_root(f)), str(f.parent))
+        ))
+        targets = [staged.get(tc.source_file.resolve()) for tc in test_cases]
+        # Byte-compile the modules under test up front so every pytest session
+        # and xdist worker loads the same .pyc instead of compiling its own
+        for staged_file in dict.fromkeys(t for t in targets if t is not None):
+            py_compile.compile(str(staged_file), doraise=False, quiet=2)
+
+        def run(indexes: list[int]) -> None:
+            batch = [test_cases[i] for i in indexes]
+            for i, result in zip(indexes, _run_test_cases(batch, staged, result_cache_dir)):
+                test_results[i] = result
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            mypy_future = pool.submit(
+                _run_mypy_batch, list(staged.values()), mypy_cache_dir, search_path,
+            ) if staged else None
+            independent = [i for i, target in enumerate(targets) if target is None]
+            if independent:
+                run(independent)
+            type_errors = mypy_future.result() if mypy_future else {}
 
+        gated = {i: target for i, target in enumerate(targets) if target is not None}
+        runnable = [i for i, target in gated.items() if not type_errors[target.resolve()]]
+        if runnable:
+            run(runnable)
+        for i in gated:
+            if test_results[i] is None:
+                test_results[i] = VerificationResult(
+                    path=test_cases[i].source_file, passed=False, errors=["skipped: mypy failed"],
+                )
 
-def verify_all(patches: list[TypeHintPatch], test_cases: list[TestCase]) -> list[VerificationResult]:
-    """Run the full verification pipeline over all generated artefacts."""
-    pass
+    results = []
+    for patch in patches:
+        errors = type_errors[staged[patch.file_path.resolve()].resolve()]
+        results.append(VerificationResult(path=patch.file_path, passed=not errors, errors=errors))
+    for result in test_results:
+        assert result is not None  # every test case ran or was skipped above
+        results.append(result)
+    return results
@@ -55,3 +55,33 @@ def test_generate_type_hint_patch_no_match(tmp_path: Path) -> None:
     hints = {"x": "str"}
     patch = generate_type_hint_patch(func, hints)
     assert patch.patched_source == patch.original_source
+
+
+def test_apply_patches_combines_patches_for_same_file(tmp_path: Path) -> None:
+    src = tmp_path / "multi.py"
+    src.write_text("def first(a,\n          b):\n    return a\n\n\ndef second(c):\n    return c\n")
+
+    first = FunctionInfo(
+        name="first", file_path=src, line_number=1, params_missing_hints=["a", "b"],
+    )
+    second = FunctionInfo(name="second", file_path=src, line_number=6, params_missing_hints=["c"])
+    patches = [
+        generate_type_hint_patch(first, {"a": "int", "b": "int", "return": "int"}),
+        generate_type_hint_patch(second, {"c": "str", "return": "str"}),
+    ]
+    results = apply_patches(patches, dry_run=False)
+
+    assert results == [
+        "def first(a: int, b: int) -> int:\n    return a\n\n\n"
+        "def second(c: str) -> str:\n    return c\n"
+    ]
+
+
+def test_generate_type_hint_patch_keeps_one_line_body(tmp_path: Path) -> None:
+    src = tmp_path / "one_liner.py"
+    src.write_text('def tag(x="a:b"): return x  # keep me\n')
+
+    func = FunctionInfo(name="tag", file_path=src, line_number=1, params_missing_hints=["x"])
+    patch = generate_type_hint_patch(func, {"x": "str", "return": "str"})
+
+    assert patch.patched_source == "def tag(x: str) -> str: return x  # keep me\n"
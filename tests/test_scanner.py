@@ -1,8 +1,19 @@
 """Tests for src.scanner."""
 
+import os
 from pathlib import Path
 
-from src.scanner import collect_python_files, get_python_files, parse_function_signatures, scan_codebase
+import pytest
+
+import src.scanner as scanner
+from src.scanner import (
+    build_project_context,
+    collect_python_files,
+    get_python_files,
+    load_source,
+    parse_function_signatures,
+    scan_codebase,
+)
 
 
 def test_collect_python_files_finds_py_files(tmp_path: Path) -> None:
@@ -21,6 +32,33 @@ def test_collect_python_files_excludes_dirs(tmp_path: Path) -> None:
     assert not any("venv" in str(p) for p in result)
 
 
+def test_collect_python_files_prunes_nested_excluded_dirs(tmp_path: Path) -> None:
+    nested = tmp_path / "pkg" / "node_modules" / "deep"
+    nested.mkdir(parents=True)
+    (nested / "vendored.py").write_text("")
+    (tmp_path / "pkg" / "mod.py").write_text("")
+    result = collect_python_files(tmp_path, exclude_dirs={"node_modules"})
+    assert [p.name for p in result] == ["mod.py"]
+
+
+def test_collect_python_files_skips_unreadable_dirs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "hidden.py").write_text("")
+    (tmp_path / "mod.py").write_text("")
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if Path(path) == locked:
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(scanner.os, "scandir", scandir)
+    assert [p.name for p in collect_python_files(tmp_path)] == ["mod.py"]
+
+
 def test_parse_function_signatures(tmp_path: Path) -> None:
     src = tmp_path / "sample.py"
     src.write_text("def greet(name):\n    return f'hi {name}'\n")
@@ -29,12 +67,105 @@ def test_parse_function_signatures(tmp_path: Path) -> None:
     assert funcs[0].name == "greet"
 
 
+def test_load_source_reparses_only_after_edit(tmp_path: Path) -> None:
+    src = tmp_path / "cached.py"
+    src.write_text("def a(): pass\n")
+    first = load_source(src)
+    assert load_source(src) is first
+
+    src.write_text("def a(): pass\ndef b(): pass\n")
+    second = load_source(src)
+    assert second is not first
+    assert len(second.tree.body) == 2
+
+
+def test_load_source_lines_follow_ast_line_numbers(tmp_path: Path) -> None:
+    f = tmp_path / "odd_breaks.py"
+    f.write_text('s = "a\x0cb\x1cc\u2028d"\n\ndef late(x):\n    return x\n', encoding="utf-8")
+    parsed = load_source(f)
+    (node,) = [n for (name, _), n in parsed.func_index.items() if name == "late"]
+    assert parsed.lines[node.lineno - 1] == "def late(x):\n"
+
+
 def test_scan_codebase_returns_scan_result(tmp_path: Path) -> None:
     (tmp_path / "a.py").write_text("def foo(x): pass\n")
     result = scan_codebase(tmp_path)
     assert result.files_scanned >= 1
 
 
+def test_scan_codebase_precomputes_missing_hints(tmp_path: Path) -> None:
+    (tmp_path / "mixed.py").write_text("def typed(x: int) -> int: pass\ndef untyped(x): pass\n")
+    result = scan_codebase(tmp_path)
+    assert [f.name for f in result.functions_missing_hints] == ["untyped"]
+    assert result.functions_missing_hints is result.functions_missing_hints
+
+
+def test_scan_codebase_records_unparsable_files(tmp_path: Path) -> None:
+    (tmp_path / "good.py").write_text("def foo(x): pass\n")
+    bad = tmp_path / "bad.py"
+    bad.write_text("def broken(\n")
+    result = scan_codebase(tmp_path)
+    assert [f.name for f in result.functions] == ["foo"]
+    assert [path for path, _ in result.errors] == [bad.resolve()]
+
+
+def test_scan_codebase_parallel_matches_file_order(tmp_path: Path) -> None:
+    for i in range(12):
+        (tmp_path / f"mod_{i:02d}.py").write_text(f"def func_{i:02d}(x): pass\n")
+    result = scan_codebase(tmp_path)
+    assert result.files_scanned == 12
+    assert [f.name for f in result.functions] == [f"func_{i:02d}" for i in range(12)]
+
+
+def test_build_project_context_truncates_at_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "big.py").write_text("x = 1\n" * 500)
+    monkeypatch.setattr(scanner, "_MAX_CONTEXT_TOKENS", 100)
+    context = build_project_context(str(tmp_path))
+    body, _, notice = context.partition("\n\n... [TRUNCATED")
+    assert len(body) == 100 * scanner._CHARS_PER_TOKEN
+    assert notice
+
+
+def test_build_project_context_summarises_only_until_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for i in range(6):
+        (tmp_path / f"mod{i}.py").write_text(f"def f{i}():\n    '''{'x' * 200}'''\n")
+    summarised: list[Path] = []
+    real = scanner._extract_file_summary
+
+    def tracking(path: Path) -> str:
+        summarised.append(path)
+        return real(path)
+
+    monkeypatch.setattr(scanner, "_extract_file_summary", tracking)
+    monkeypatch.setattr(scanner, "_FULL_BODY_TOKEN_BUDGET", 0)
+    monkeypatch.setattr(scanner, "_MAX_CONTEXT_TOKENS", 150)
+    assert "TRUNCATED" in build_project_context(str(tmp_path))
+    assert 0 < len(summarised) < 6
+
+
+def test_build_project_context_rebuilds_after_edit(tmp_path: Path) -> None:
+    mod = tmp_path / "mod.py"
+    mod.write_text("def old(): pass\n")
+    first = build_project_context(str(tmp_path))
+    assert build_project_context(str(tmp_path)) is first
+
+    mod.write_text("def renamed(): pass\n")
+    assert "renamed" in build_project_context(str(tmp_path))
+
+
+def test_build_project_context_rebuilds_after_rename(tmp_path: Path) -> None:
+    mod = tmp_path / "before.py"
+    mod.write_text("def f(): pass\n")
+    assert "before.py" in build_project_context(str(tmp_path))
+
+    mod.rename(tmp_path / "after.py")
+    assert "after.py" in build_project_context(str(tmp_path))
+
+
 # ── get_python_files tests ───────────────────────────────────────────
 
 
@@ -2,7 +2,18 @@
 
 from pathlib import Path
 
-from src.verifier import verify_syntax
+import src.verifier as verifier
+from src.generator import TestCase as GeneratedTestCase, TypeHintPatch
+from src.verifier import (
+    run_mypy,
+    run_pytest,
+    stop_mypy_daemon,
+    verify_all,
+    verify_syntax,
+    verify_test_files,
+    verify_tests,
+    verify_type_hints,
+)
 
 
 def test_verify_syntax_valid_file(tmp_path: Path) -> None:
@@ -17,3 +28,354 @@ def test_verify_syntax_invalid_file(tmp_path: Path) -> None:
     f.write_text("def broken(\n")
     result = verify_syntax(f)
     assert not result.passed
+    assert result.errors[0].endswith("at line 1")
+
+
+def test_verify_syntax_rechecks_only_after_edit(tmp_path: Path) -> None:
+    f = tmp_path / "mod.py"
+    f.write_text("x = 1\n")
+    first = verify_syntax(f)
+    assert verify_syntax(f) is first
+    f.write_text("x = (\n")
+    assert not verify_syntax(f).passed
+
+
+def test_run_pytest_reports_pass_and_fail(tmp_path: Path) -> None:
+    good = tmp_path / "test_good.py"
+    good.write_text("def test_ok():\n    assert True\n")
+    bad = tmp_path / "test_bad.py"
+    bad.write_text("def test_fails():\n    assert False\n")
+    assert run_pytest(str(good))
+    assert not run_pytest(str(bad))
+
+
+def test_run_pytest_prints_nothing(tmp_path: Path, capfd) -> None:
+    f = tmp_path / "test_quiet.py"
+    f.write_text("def test_ok():\n    assert True\n")
+    assert run_pytest(str(f))
+    assert capfd.readouterr().out == ""
+
+
+def test_xdist_needs_at_least_two_spare_cores(monkeypatch) -> None:
+    monkeypatch.setattr(verifier.importlib.util, "find_spec", lambda name: object())
+    monkeypatch.setattr(verifier.os, "cpu_count", lambda: 3)
+    assert verifier._xdist_args(10) == []
+    monkeypatch.setattr(verifier.os, "cpu_count", lambda: 8)
+    assert verifier._xdist_args(10) == ["-p", "xdist.plugin", "-n", "6"]
+    assert verifier._xdist_args(2) == []
+
+
+def test_verify_all_runs_test_cases_in_one_session(tmp_path: Path) -> None:
+    src = tmp_path / "calc.py"
+    src.write_text("def add(a: int, b: int) -> int:\n    return a + b\n")
+    patch = TypeHintPatch(file_path=src, original_source="", patched_source=src.read_text())
+    cases = [
+        GeneratedTestCase(
+            "add", src, "from calc import add\n\ndef test_add():\n    assert add(1, 2) == 3\n",
+        ),
+        GeneratedTestCase(
+            "add", src, "from calc import add\n\ndef test_add():\n    assert add(1, 2) == 4\n",
+        ),
+    ]
+    results = verify_all(
+        [patch], cases, mypy_cache_dir=str(tmp_path / "cache"), result_cache_dir=None,
+    )
+    assert [r.passed for r in results] == [True, True, False]
+    assert "test_add" in results[2].errors[0]
+
+
+def test_verify_all_shards_larger_batches(tmp_path: Path) -> None:
+    src = tmp_path / "shard.py"
+    src.write_text("def one() -> int:\n    return 1\n")
+    code = "from shard import one\n\ndef test_one():\n    assert one() == {}\n"
+    cases = [GeneratedTestCase("one", src, code.format(n)) for n in (1, 1, 1, 2)]
+    results = verify_all([], cases, result_cache_dir=None)
+    assert [r.passed for r in results] == [True, True, True, False]
+
+
+def test_verify_all_reuses_cached_test_outcomes(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "cachedmod.py"
+    src.write_text("def two() -> int:\n    return 2\n")
+    case = GeneratedTestCase(
+        "two", src, "from cachedmod import two\n\ndef test_two():\n    assert two() == 2\n",
+    )
+    cache = tmp_path / "results"
+    assert verify_all([], [case], result_cache_dir=cache)[0].passed
+
+    def fail_if_run(*args, **kwargs):
+        raise AssertionError("pytest should not run on a cache hit")
+
+    monkeypatch.setattr(verifier, "_run_pytest_batch", fail_if_run)
+    assert verify_all([], [case], result_cache_dir=cache)[0].passed
+
+    src.write_text("def two() -> int:\n    return 2 + 1\n")
+    monkeypatch.undo()
+    assert not verify_all([], [case], result_cache_dir=cache)[0].passed
+
+
+def test_verify_all_never_caches_outcomes_for_unreadable_modules(tmp_path: Path) -> None:
+    missing = tmp_path / "gone.py"
+    cache = tmp_path / "results"
+    passing = GeneratedTestCase("f", missing, "def test_ok():\n    assert True\n")
+    failing = GeneratedTestCase("f", missing, "def test_bad():\n    assert False\n")
+    assert verify_all([], [passing], result_cache_dir=cache)[0].passed
+    assert not verify_all([], [failing], result_cache_dir=cache)[0].passed
+    assert not cache.exists() or not any(cache.iterdir())
+
+
+def test_verify_type_hints_reports_mypy_errors(tmp_path: Path) -> None:
+    good = tmp_path / "good.py"
+    good.write_text("def f(x: int) -> int:\n    return x\n")
+    bad = tmp_path / "bad.py"
+    bad.write_text("def f(x: int) -> str:\n    return x\n")
+    assert verify_type_hints(good, cache_dir=str(tmp_path / "cache")).passed
+    result = verify_type_hints(bad, cache_dir=str(tmp_path / "cache"))
+    assert not result.passed
+    assert result.errors[0].startswith("line 2:")
+
+
+def test_parse_mypy_line() -> None:
+    line = '/src/app.py:12:5: error: Incompatible return value type  [return-value]\n'
+    assert verifier._parse_mypy_line(line) == (
+        "/src/app.py", 12, "error", "Incompatible return value type  [return-value]",
+    )
+    assert verifier._parse_mypy_line("/src/app.py:3: note: See docs") == (
+        "/src/app.py", 3, "note", "See docs",
+    )
+    assert verifier._parse_mypy_line('/src/utils.py: error: Duplicate module named "utils"') == (
+        "/src/utils.py", None, "error", 'Duplicate module named "utils"',
+    )
+    assert verifier._parse_mypy_line("Success: no issues found in 1 source file") is None
+
+
+def test_verify_all_checks_same_named_modules_separately(tmp_path: Path) -> None:
+    sources = {
+        "a": "def f(x: int) -> str:\n    return x\n",
+        "b": "def f(x: int) -> int:\n    return x\n",
+    }
+    patches = []
+    for pkg, source in sources.items():
+        f = tmp_path / pkg / "utils.py"
+        f.parent.mkdir()
+        f.write_text(source)
+        patches.append(TypeHintPatch(file_path=f, original_source=source, patched_source=source))
+    results = verify_all(patches, [], mypy_cache_dir=str(tmp_path / "cache"))
+    assert [r.passed for r in results] == [False, True]
+    assert results[0].errors[0].endswith("[return-value]")
+
+
+def test_verify_type_hints_reuses_cache_dir(tmp_path: Path) -> None:
+    f = tmp_path / "cached.py"
+    f.write_text("def f(x: int) -> int:\n    return x\n")
+    cache = tmp_path / "cache"
+    assert verify_type_hints(f, cache_dir=str(cache)).passed
+    assert list(cache.glob("*/cache*.db"))
+    assert verify_type_hints(f, cache_dir=str(cache)).passed
+
+
+def test_run_mypy_through_daemon(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(verifier, "_DMYPY_STATUS_FILE", str(tmp_path / "dmypy.json"))
+    good = tmp_path / "typed_ok.py"
+    good.write_text("def f(x: int) -> int:\n    return x\n")
+    bad = tmp_path / "typed_bad.py"
+    bad.write_text("def f(x: int) -> str:\n    return x\n")
+    try:
+        assert run_mypy(str(good), cache_dir=str(tmp_path / "cache"))
+        assert not run_mypy(str(bad), cache_dir=str(tmp_path / "cache"))
+    finally:
+        stop_mypy_daemon()
+
+
+def test_verify_tests_runs_plain_tests_without_pytest(tmp_path: Path, monkeypatch) -> None:
+    def fail_if_run(*args, **kwargs):
+        raise AssertionError("plain tests should not need pytest")
+
+    monkeypatch.setattr(verifier, "_run_pytest_batch", fail_if_run)
+    f = tmp_path / "test_plain.py"
+    f.write_text(
+        "def test_ok():\n    assert 1 + 1 == 2\n\ndef test_bad():\n    assert 1 + 1 == 3\n"
+    )
+    result = verify_tests(f)
+    assert not result.passed
+    assert result.errors == ["test_plain.py::test_bad: AssertionError"]
+
+
+def test_verify_tests_uses_pytest_for_fixtures(tmp_path: Path) -> None:
+    f = tmp_path / "test_fixture.py"
+    f.write_text(
+        "import pytest\n\n@pytest.fixture\ndef value():\n    return 2\n\n"
+        "def test_value(value):\n    assert value == 2\n"
+    )
+    assert verify_tests(f).passed
+
+
+def test_verify_tests_matches_pytest_for_skips_exits_and_generators(tmp_path: Path) -> None:
+    skipped = tmp_path / "test_skipped.py"
+    skipped.write_text("import pytest\n\ndef test_later():\n    pytest.skip('not yet')\n")
+    assert verify_tests(skipped).passed
+
+    exits = tmp_path / "test_exits.py"
+    exits.write_text("import sys\n\ndef test_exit():\n    sys.exit(0)\n")
+    assert not verify_tests(exits).passed
+
+    generator = tmp_path / "test_generator.py"
+    generator.write_text("def test_gen():\n    yield 1\n    assert False\n")
+    assert not verify_tests(generator).passed
+
+
+def test_verify_tests_leaves_classes_hooks_and_conftests_to_pytest(tmp_path: Path) -> None:
+    unittest_case = tmp_path / "test_unittest_case.py"
+    unittest_case.write_text(
+        "import unittest\n\nclass Checks(unittest.TestCase):\n"
+        "    def test_bad(self):\n        self.assertEqual(1, 2)\n"
+    )
+    assert not verify_tests(unittest_case).passed
+
+    hooked = tmp_path / "test_hooked.py"
+    hooked.write_text(
+        "state = []\n\ndef setup_function(fn):\n    state.append(1)\n\n"
+        "def test_set_up():\n    assert state\n"
+    )
+    assert verify_tests(hooked).passed
+
+    nested = tmp_path / "pkg" / "sub"
+    nested.mkdir(parents=True)
+    (tmp_path / "pkg" / "conftest.py").write_text(
+        "import os, pytest\n\n@pytest.fixture(autouse=True)\n"
+        "def flag(monkeypatch):\n    monkeypatch.setenv('VERIFY_FLAG', '1')\n"
+    )
+    uses_conftest = nested / "test_uses_conftest.py"
+    uses_conftest.write_text(
+        "import os\n\ndef test_flag():\n    assert os.environ['VERIFY_FLAG']\n"
+    )
+    assert verifier._run_simple_tests(uses_conftest) is None
+
+
+def test_verify_tests_discards_plain_test_output(tmp_path: Path, capfd, monkeypatch) -> None:
+    def fail_if_run(*args, **kwargs):
+        raise AssertionError("plain tests should not need pytest")
+
+    monkeypatch.setattr(verifier, "_run_pytest_batch", fail_if_run)
+    f = tmp_path / "test_noisy.py"
+    f.write_text(
+        "import sys\n\ndef test_noisy():\n    print('hi')\n    print('x', file=sys.stderr)\n"
+    )
+    assert verify_tests(f).passed
+    assert capfd.readouterr() == ("", "")
+
+
+def test_verify_all_reports_syntax_and_type_errors_per_patch(tmp_path: Path) -> None:
+    sources = ["x: int = 1\n", "x = (\n", "def f(x: int) -> str:\n    return x\n"]
+    patches = []
+    for i, source in enumerate(sources):
+        f = tmp_path / f"mod{i}.py"
+        f.write_text(source)
+        patches.append(TypeHintPatch(file_path=f, original_source="", patched_source=source))
+    results = verify_all(patches, [], mypy_cache_dir=str(tmp_path / "cache"))
+    assert [r.passed for r in results] == [True, False, False]
+    assert results[1].errors[0].endswith("[syntax]")
+    assert results[2].errors[0].endswith("[return-value]")
+
+
+def test_verify_test_files_reports_each_file_in_order(tmp_path: Path) -> None:
+    plain = tmp_path / "test_plain_ok.py"
+    plain.write_text("def test_ok():\n    assert True\n")
+    fixture = tmp_path / "test_needs_fixture.py"
+    fixture.write_text("def test_tmp(tmp_path):\n    assert tmp_path.is_dir()\n")
+    missing = tmp_path / "test_missing.py"
+    results = verify_test_files([fixture, missing, plain])
+    assert [r.path for r in results] == [fixture, missing, plain]
+    assert [r.passed for r in results] == [True, False, True]
+    assert results[1].errors == ["test file not found"]
+
+
+def test_verify_all_checks_patched_source_not_disk(tmp_path: Path) -> None:
+    src = tmp_path / "staged.py"
+    src.write_text("def half(x):\n    return x // 2\n")
+    patched = "def half(x: int) -> int:\n    return x // 2 + 0\n"
+    patch = TypeHintPatch(file_path=src, original_source=src.read_text(), patched_source=patched)
+    case = GeneratedTestCase(
+        "half", src,
+        "import inspect\nfrom staged import half\n\n"
+        "def test_patched():\n    assert '+ 0' in inspect.getsource(half)\n",
+    )
+    results = verify_all(
+        [patch], [case], mypy_cache_dir=str(tmp_path / "cache"), result_cache_dir=None,
+    )
+    assert [r.passed for r in results] == [True, True]
+    assert "x: int" not in src.read_text()
+
+
+def test_stage_patched_sources_copies_only_python_files(tmp_path: Path) -> None:
+    pkg = tmp_path / "project" / "datapkg"
+    (pkg / "assets").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "util.py").write_text("")
+    (pkg / "assets" / "blob.bin").write_bytes(b"\0" * 1024)
+    src = pkg / "core.py"
+    src.write_text("def g(x):\n    return x\n")
+    patch = TypeHintPatch(
+        file_path=src, original_source=src.read_text(),
+        patched_source="def g(x: int) -> int:\n    return x\n",
+    )
+    stage = tmp_path / "stage"
+    stage.mkdir()
+    staged = verifier._stage_patched_sources([patch], stage)[src.resolve()]
+    assert staged.read_text().startswith("def g(x: int)")
+    assert (staged.parent / "util.py").exists()
+    assert not (staged.parent / "assets" / "blob.bin").exists()
+
+
+def test_verify_all_stages_patched_modules_inside_their_package(tmp_path: Path) -> None:
+    pkg = tmp_path / "stagedpkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "util.py").write_text("def helper(x: int) -> int:\n    return x + 1\n")
+    src = pkg / "core.py"
+    src.write_text("from .util import helper\n\ndef g(x):\n    return helper(x)\n")
+    patched = "from .util import helper\n\ndef g(x: int) -> int:\n    return helper(x) + 0\n"
+    patch = TypeHintPatch(file_path=src, original_source=src.read_text(), patched_source=patched)
+    case = GeneratedTestCase(
+        "g", src,
+        "import inspect\nfrom stagedpkg.core import g\n\n"
+        "def test_patched():\n    assert g(1) == 2\n    assert '+ 0' in inspect.getsource(g)\n",
+    )
+    results = verify_all(
+        [patch], [case], mypy_cache_dir=str(tmp_path / "cache"), result_cache_dir=None,
+    )
+    assert [r.passed for r in results] == [True, True], results
+
+
+def test_verify_all_skips_tests_for_patches_failing_mypy(tmp_path: Path, monkeypatch) -> None:
+    src = tmp_path / "illtyped.py"
+    src.write_text("def name(x):\n    return x\n")
+    patch = TypeHintPatch(
+        file_path=src, original_source=src.read_text(),
+        patched_source="def name(x: int) -> str:\n    return x\n",
+    )
+    case = GeneratedTestCase(
+        "name", src, "from illtyped import name\n\ndef test_name():\n    assert name(1) == 1\n",
+    )
+
+    def fail_if_run(*args, **kwargs):
+        raise AssertionError("tests for a patch failing mypy should not run")
+
+    monkeypatch.setattr(verifier, "_run_pytest_batch", fail_if_run)
+    results = verify_all(
+        [patch], [case], mypy_cache_dir=str(tmp_path / "cache"), result_cache_dir=None,
+    )
+    assert [r.passed for r in results] == [False, False]
+    assert results[0].errors[0].endswith("[return-value]")
+    assert results[1].errors == ["skipped: mypy failed"]
+
+
+def test_verify_test_files_survives_collection_errors(tmp_path: Path) -> None:
+    good = tmp_path / "test_good_batch.py"
+    good.write_text(
+        "import pytest\n\n@pytest.mark.parametrize('v', [1])\ndef test_v(v):\n    assert v\n"
+    )
+    broken = tmp_path / "test_broken_batch.py"
+    broken.write_text("import not_a_real_module_xyz\n\ndef test_x():\n    pass\n")
+    results = verify_test_files([good, broken])
+    assert [r.passed for r in results] == [True, False]
+    assert "ModuleNotFoundError" in results[1].errors[0]